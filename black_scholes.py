@@ -0,0 +1,85 @@
+import numpy as np
+from scipy.special import ndtr
+
+
+def black_scholes_price(option_type, spot, strike, expiry, rate, dividend, vol):
+    """
+    Closed-form Black-Scholes-Merton prices of European options.
+
+    Inputs broadcast against each other, so whole books and scenario sets
+    are priced in one pass. Rates and yields are continuously compounded
+    and expiry is in years, matching AnalyticEuropeanEngine on flat
+    FlatForward curves and a BlackConstantVol sharing one day counter.
+
+    Args:
+    option_type (array-like): ql.Option.Call (1) or ql.Option.Put (-1)
+    spot (array-like): Spot price of the underlying
+    strike (array-like): Strike price
+    expiry (array-like): Time to expiry in years; expired options are worth their intrinsic value
+    rate (array-like): Risk-free rate
+    dividend (array-like): Dividend yield
+    vol (array-like): Black volatility
+
+    Returns:
+    np.ndarray: Option prices
+    """
+    phi = np.asarray(option_type, dtype=float)
+    spot = np.asarray(spot, dtype=float)
+    strike = np.asarray(strike, dtype=float)
+    expiry = np.maximum(np.asarray(expiry, dtype=float), 0.0)
+    discount = np.exp(-np.asarray(rate, dtype=float) * expiry)
+    forward = spot * np.exp(-np.asarray(dividend, dtype=float) * expiry) / discount
+    std_dev = np.asarray(vol, dtype=float) * np.sqrt(expiry)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        d1 = np.log(forward / strike) / std_dev + 0.5 * std_dev
+        d2 = d1 - std_dev
+        price = discount * phi * (forward * ndtr(phi * d1) - strike * ndtr(phi * d2))
+    # Without variance the option is worth its discounted intrinsic value on the forward
+    intrinsic = discount * np.maximum(phi * (forward - strike), 0.0)
+    return np.where(std_dev > 0.0, price, intrinsic)
+
+
+def black_scholes_greeks(option_type, spot, strike, expiry, rate, dividend, vol):
+    """
+    Closed-form Black-Scholes-Merton price and greeks of European options.
+
+    Takes the same broadcasting inputs as black_scholes_price and follows
+    AnalyticEuropeanEngine's conventions: vega and rho per unit change of vol
+    and rate, theta per year. Greeks of options with no time or variance
+    left are NaN.
+
+    Returns:
+    dict: Arrays 'npv', 'delta', 'gamma', 'vega', 'theta' and 'rho'
+    """
+    phi = np.asarray(option_type, dtype=float)
+    spot = np.asarray(spot, dtype=float)
+    strike = np.asarray(strike, dtype=float)
+    expiry = np.asarray(expiry, dtype=float)
+    rate = np.asarray(rate, dtype=float)
+    dividend = np.asarray(dividend, dtype=float)
+    vol = np.asarray(vol, dtype=float)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sqrt_t = np.sqrt(expiry)
+        std_dev = vol * sqrt_t
+        dividend_discount = np.exp(-dividend * expiry)
+        discount = np.exp(-rate * expiry)
+        d1 = (np.log(spot / strike) + (rate - dividend) * expiry) / std_dev + 0.5 * std_dev
+        d2 = d1 - std_dev
+        cdf1 = ndtr(phi * d1)
+        cdf2 = ndtr(phi * d2)
+        density = np.exp(-0.5 * d1 * d1) / np.sqrt(2.0 * np.pi)
+
+        npv = phi * (spot * dividend_discount * cdf1 - strike * discount * cdf2)
+        delta = phi * dividend_discount * cdf1
+        gamma = dividend_discount * density / (spot * std_dev)
+        vega = spot * dividend_discount * density * sqrt_t
+        theta = rate * npv - (rate - dividend) * spot * delta - 0.5 * vol * vol * spot * spot * gamma
+        rho = phi * strike * expiry * discount * cdf2
+
+    alive = std_dev > 0.0
+    greeks = {'npv': np.where(alive, npv, black_scholes_price(phi, spot, strike, expiry, rate, dividend, vol))}
+    for name, value in (('delta', delta), ('gamma', gamma), ('vega', vega), ('theta', theta), ('rho', rho)):
+        greeks[name] = np.where(alive, value, np.nan)
+    return greeks
@@ -0,0 +1,233 @@
+import datetime
+import os
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from get_files_with_ext import _name_matcher
+
+# Directories modified this close to a scan may change again within the same
+# mtime tick, so their mtime is not trusted and they are re-listed next refresh
+_RACY_NS = 2_000_000_000
+
+# Bumped whenever what gets stored changes; older databases are rebuilt on the next refresh
+_VERSION = '2'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, parent TEXT, mtime_ns INTEGER);
+CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, dir TEXT NOT NULL, name TEXT NOT NULL,
+                                  ext TEXT NOT NULL, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL);
+CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+CREATE INDEX IF NOT EXISTS files_ext ON files (ext);
+CREATE INDEX IF NOT EXISTS files_size ON files (size);
+CREATE INDEX IF NOT EXISTS files_mtime ON files (mtime_ns);
+"""
+
+
+def _extension(name):
+    # Everything from the last dot, so a file named '.py' has extension '.py' as
+    # get_files_with_extension's name.endswith matches it (os.path.splitext gives '')
+    dot = name.rfind('.')
+    return name[dot:] if dot >= 0 else ''
+
+
+def _timestamp_ns(when):
+    if isinstance(when, datetime.datetime):
+        when = when.timestamp()
+    elif isinstance(when, datetime.date):
+        when = datetime.datetime(when.year, when.month, when.day).timestamp()
+    return int(when * 1e9)
+
+
+class DirectoryIndex:
+    """
+    Persistent SQLite index of the files under one root: path, size, mtime and extension.
+
+    refresh() stats every indexed directory but only lists the ones whose
+    mtime changed since the last refresh, i.e. those where files were
+    added, removed or renamed; the rest of the tree is taken from the
+    index. Rewriting a file in place does not touch its directory's mtime,
+    so such edits are only picked up by refresh(full=True). Queries never
+    touch the file system.
+
+    Args:
+    db_path (str): SQLite database file, created if needed
+    root (str): Directory indexed; a database only ever indexes one root
+    ignore_dirs (list): Directory names or globs not to descend into
+    max_workers (int): Threads listing directories; None uses ThreadPoolExecutor's default
+    """
+
+    def __init__(self, db_path, root, ignore_dirs=(), max_workers=None):
+        self.root = os.path.abspath(root)
+        self.max_workers = max_workers
+        self._ignored = _name_matcher(ignore_dirs, extensions=False) if ignore_dirs else (lambda name: False)
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute("INSERT OR IGNORE INTO meta VALUES ('root', ?)", (self.root,))
+        indexed_root = self._meta('root')
+        if indexed_root != self.root:
+            self._conn.close()
+            raise ValueError(f"{db_path} indexes {indexed_root}, not {self.root}")
+        if self._meta('version') != _VERSION:
+            with self._conn:
+                self._conn.execute('DELETE FROM files')
+                self._conn.execute('DELETE FROM dirs')
+                self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (_VERSION,))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._conn.close()
+
+    def _meta(self, key):
+        row = self._conn.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    def _visit(self, path, known_mtime, full):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None, None
+        if not full and mtime == known_mtime:
+            return mtime, None
+        files, subdirs = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        st = entry.stat(follow_symlinks=False)
+                    files.append((entry.path, path, entry.name, _extension(entry.name), st.st_size,
+                                  st.st_mtime_ns))
+        except OSError:
+            return None, None
+        return mtime, (files, subdirs)
+
+    def refresh(self, full=False):
+        """
+        Brings the index up to date with the file system.
+
+        Args:
+        full (bool): List every directory, also catching files rewritten in place
+
+        Returns:
+        dict: Directories listed, directories taken from the index, directories
+            removed and elapsed seconds
+        """
+        start = time.perf_counter()
+        racy_limit = time.time_ns() - _RACY_NS
+        known = dict(self._conn.execute('SELECT path, mtime_ns FROM dirs'))
+        children = {}
+        for path, parent in self._conn.execute('SELECT path, parent FROM dirs'):
+            children.setdefault(parent, []).append(path)
+
+        counts = {'listed': 0, 'unchanged': 0, 'removed': 0}
+        seen = set()
+        with self._conn, ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {pool.submit(self._visit, self.root, known.get(self.root), full): (self.root, None)}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, parent = pending.pop(future)
+                    mtime, listing = future.result()
+                    if mtime is None:
+                        continue
+                    seen.add(path)
+                    if listing is None:
+                        counts['unchanged'] += 1
+                        subdirs = children.get(path, [])
+                    else:
+                        counts['listed'] += 1
+                        files, subdirs = listing
+                        self._conn.execute('DELETE FROM files WHERE dir = ?', (path,))
+                        self._conn.executemany('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)', files)
+                    self._conn.execute('INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)',
+                                       (path, parent, mtime if mtime < racy_limit else None))
+                    for subdir in subdirs:
+                        if not self._ignored(os.path.basename(subdir)):
+                            pending[pool.submit(self._visit, subdir, known.get(subdir), full)] = (subdir, path)
+
+            # Directories no longer reachable: deleted, unreadable or now ignored
+            gone = [(path,) for path in known.keys() - seen]
+            self._conn.executemany('DELETE FROM files WHERE dir = ?', gone)
+            self._conn.executemany('DELETE FROM dirs WHERE path = ?', gone)
+            counts['removed'] = len(gone)
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('refreshed_at', ?)", (str(time.time()),))
+        counts['seconds'] = time.perf_counter() - start
+        return counts
+
+    def query(self, extensions=None, min_size=None, max_size=None, modified_since=None, details=False):
+        """
+        Indexed files matching every given criterion, sorted by path.
+
+        Args:
+        extensions (str or list): Extensions such as '.txt' or 'txt', matched case-sensitively
+            like get_files_with_extension
+        min_size (int): Smallest size in bytes
+        max_size (int): Largest size in bytes
+        modified_since (datetime, date or float): Earliest modification time (POSIX seconds if a number)
+        details (bool): Return (path, size, mtime) tuples, mtime in POSIX seconds, instead of paths
+
+        Returns:
+        list: Paths, or tuples with details
+        """
+        clauses, params = [], []
+        if extensions is not None:
+            if isinstance(extensions, str):
+                extensions = [extensions]
+            extensions = [e if e.startswith('.') else '.' + e for e in extensions]
+            # Single extensions use the indexed ext column; compound ones ('.tar.gz') match the name's end
+            simple = [e for e in extensions if e.count('.') == 1]
+            either = []
+            if simple:
+                either.append(f"ext IN ({', '.join('?' * len(simple))})")
+                params.extend(simple)
+            for e in extensions:
+                if e.count('.') > 1:
+                    either.append('substr(name, -?) = ?')
+                    params.extend([len(e), e])
+            clauses.append(f"({' OR '.join(either)})")
+        if min_size is not None:
+            clauses.append('size >= ?')
+            params.append(int(min_size))
+        if max_size is not None:
+            clauses.append('size <= ?')
+            params.append(int(max_size))
+        if modified_since is not None:
+            clauses.append('mtime_ns >= ?')
+            params.append(_timestamp_ns(modified_since))
+        columns = 'path, size, mtime_ns' if details else 'path'
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ''
+        rows = self._conn.execute(f'SELECT {columns} FROM files{where} ORDER BY path', params)
+        if details:
+            return [(path, size, mtime_ns / 1e9) for path, size, mtime_ns in rows]
+        return [row[0] for row in rows]
+
+    def stats(self):
+        directories, = self._conn.execute('SELECT COUNT(*) FROM dirs').fetchone()
+        files, total_bytes = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM files').fetchone()
+        refreshed_at = self._meta('refreshed_at')
+        return {
+            'root': self.root,
+            'directories': directories,
+            'files': files,
+            'bytes': total_bytes,
+            'refreshed_at': float(refreshed_at) if refreshed_at is not None else None,
+        }
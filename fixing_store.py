@@ -0,0 +1,156 @@
+import os
+import re
+import tempfile
+
+import numpy as np
+import QuantLib as ql
+
+DATE_DTYPE = np.dtype('<i4')
+VALUE_DTYPE = np.dtype('<f8')
+
+# Building ql.Date objects dominates bulk loads, so they are shared across
+# loads and indexes; there are only ~365 distinct dates per year of history.
+_ql_dates = {}
+
+
+def _ql_date(serial):
+    date = _ql_dates.get(serial)
+    if date is None:
+        date = _ql_dates[serial] = ql.Date(serial)
+    return date
+
+
+def _serials(dates):
+    return np.array([d if isinstance(d, (int, np.integer)) else
+                     (d.serialNumber() if isinstance(d, ql.Date) else ql.Date(d.day, d.month, d.year).serialNumber())
+                     for d in dates], dtype=DATE_DTYPE)
+
+
+class FixingStore:
+    """
+    Columnar on-disk store of index fixings, one pair of raw files per index.
+
+    Each index is kept as '<name>.dates' (int32 QuantLib serial numbers) and
+    '<name>.values' (float64), both sorted by date. Reads are memory-mapped,
+    appends of newer fixings write only the new tail, and a whole history is
+    handed to QuantLib in a single Index.addFixings call.
+
+    Args:
+    root (str): Directory holding the store, created if needed
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, name, column):
+        safe = re.sub(r'[^A-Za-z0-9_.-]+', '_', name)
+        return os.path.join(self.root, f'{safe}.{column}')
+
+    def _replace(self, name, column, array):
+        # Written to a temporary file and renamed, so maps handed out by read() keep the old contents
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(array.tobytes())
+            os.replace(tmp, self._path(name, column))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def names(self):
+        """
+        Returns the stored index names, as sanitized for file names.
+        """
+        return sorted(f[:-len('.dates')] for f in os.listdir(self.root) if f.endswith('.dates'))
+
+    def read(self, name):
+        """
+        Memory-maps the stored history of an index.
+
+        Returns:
+        tuple: (dates, values) arrays; dates are QuantLib serial numbers
+        """
+        dates_path = self._path(name, 'dates')
+        if not os.path.exists(dates_path) or os.path.getsize(dates_path) == 0:
+            return np.empty(0, dtype=DATE_DTYPE), np.empty(0, dtype=VALUE_DTYPE)
+        dates = np.memmap(dates_path, dtype=DATE_DTYPE, mode='r')
+        values = np.memmap(self._path(name, 'values'), dtype=VALUE_DTYPE, mode='r')
+        if len(dates) != len(values):
+            raise ValueError(f"{name}: {len(dates)} dates but {len(values)} values stored")
+        return dates, values
+
+    def append(self, name, dates, values, index=None):
+        """
+        Adds fixings for an index.
+
+        Fixings later than the last stored date are appended to the files in
+        place; anything else is merged, with new values replacing old ones on
+        the same date, and the files are rewritten.
+
+        Args:
+        name (str): Index name, usually index.name()
+        dates (list): ql.Date, datetime.date or serial number of each fixing
+        values (array-like): Fixing values
+        index (ql.Index): If given, dates that are not valid fixing dates for it are dropped
+
+        Returns:
+        int: Number of fixings added or replaced
+        """
+        new_dates = _serials(dates)
+        new_values = np.asarray(values, dtype=VALUE_DTYPE)
+        if len(new_dates) != len(new_values):
+            raise ValueError("dates and values must have the same length")
+        if index is not None:
+            valid = np.array([index.isValidFixingDate(_ql_date(s)) for s in new_dates.tolist()], dtype=bool)
+            new_dates, new_values = new_dates[valid], new_values[valid]
+        if len(new_dates) == 0:
+            return 0
+
+        # Sort and keep the last value given for each date
+        order = np.argsort(new_dates, kind='stable')
+        new_dates, new_values = new_dates[order], new_values[order]
+        last = np.append(new_dates[1:] != new_dates[:-1], True)
+        new_dates, new_values = new_dates[last], new_values[last]
+        n_added = len(new_dates)
+
+        old_dates, old_values = self.read(name)
+        if len(old_dates) == 0 or new_dates[0] > old_dates[-1]:
+            # Appending leaves the stored bytes, and so any existing maps, untouched
+            with open(self._path(name, 'dates'), 'ab') as f:
+                f.write(new_dates.astype(DATE_DTYPE).tobytes())
+            with open(self._path(name, 'values'), 'ab') as f:
+                f.write(new_values.astype(VALUE_DTYPE).tobytes())
+            return n_added
+
+        keep = ~np.isin(old_dates, new_dates)
+        merged_dates = np.concatenate([old_dates[keep], new_dates])
+        merged_values = np.concatenate([old_values[keep], new_values])
+        order = np.argsort(merged_dates, kind='stable')
+        del old_dates, old_values
+        # Each column is swapped in whole; read() reports a crash between the two as a length mismatch
+        self._replace(name, 'values', merged_values[order].astype(VALUE_DTYPE))
+        self._replace(name, 'dates', merged_dates[order].astype(DATE_DTYPE))
+        return n_added
+
+    def load_into(self, index, name=None, start=None, end=None, force_overwrite=False):
+        """
+        Adds the stored history of an index to it in one bulk call.
+
+        Args:
+        index (ql.Index): Index to receive the fixings
+        name (str): Stored name, index.name() by default
+        start (ql.Date): Skip fixings before this date
+        end (ql.Date): Skip fixings after this date
+        force_overwrite (bool): Replace fixings the index already has
+
+        Returns:
+        int: Number of fixings loaded
+        """
+        dates, values = self.read(name if name is not None else index.name())
+        lo = np.searchsorted(dates, start.serialNumber()) if start is not None else 0
+        hi = np.searchsorted(dates, end.serialNumber(), side='right') if end is not None else len(dates)
+        if hi <= lo:
+            return 0
+        index.addFixings([_ql_date(s) for s in dates[lo:hi].tolist()], values[lo:hi].tolist(), force_overwrite)
+        return int(hi - lo)
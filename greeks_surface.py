@@ -0,0 +1,156 @@
+import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+from black_scholes import black_scholes_greeks
+
+GREEKS = ('npv', 'delta', 'gamma', 'vega', 'theta', 'rho')
+
+# Per-process market used by pool workers, built once per worker
+_worker_market = None
+
+# Day counters cross process boundaries by name
+_day_counters = {
+    ql.Actual365Fixed().name(): ql.Actual365Fixed,
+    ql.Actual360().name(): ql.Actual360,
+}
+
+
+def _label(date):
+    return pd.Timestamp(datetime.date(date.year(), date.month(), date.dayOfMonth()))
+
+
+def _frames(values, strikes, maturities):
+    index = pd.Index(np.asarray(strikes, dtype=float), name='strike')
+    columns = pd.DatetimeIndex([_label(m) for m in maturities], name='maturity')
+    return {name: pd.DataFrame(values[name], index=index, columns=columns) for name in GREEKS}
+
+
+def greeks_surface(strikes, maturities, spot, rate, dividend, vol, option_type=ql.Option.Call, day_count=None):
+    """
+    Price and greeks of European options over a strike x maturity grid in one closed-form pass.
+
+    The market matches the BlackScholesMertonProcess of qlib_model_creation.py:
+    flat risk-free and dividend curves and a Black vol sharing one day
+    counter, with greeks in AnalyticEuropeanEngine's conventions.
+
+    Args:
+    strikes (array-like): Strikes, the rows of each surface
+    maturities (list): ql.Date maturities, the columns of each surface
+    spot (float): Spot price of the underlying
+    rate (float): Flat risk-free rate
+    dividend (float): Flat dividend yield
+    vol (float or array-like): Black volatility, or a strike x maturity array of them
+    option_type (int): ql.Option.Call or ql.Option.Put
+    day_count (ql.DayCounter): Day count of the curves and vol, Actual365Fixed by default
+
+    Returns:
+    dict: Greek name -> pd.DataFrame indexed by strike with one column per maturity
+    """
+    day_count = day_count if day_count is not None else ql.Actual365Fixed()
+    today = ql.Settings.instance().evaluationDate
+    expiries = np.array([day_count.yearFraction(today, m) for m in maturities])
+    values = black_scholes_greeks(option_type, spot, np.asarray(strikes, dtype=float)[:, None], expiries[None, :],
+                                  rate, dividend, vol)
+    shape = (len(strikes), len(maturities))
+    return _frames({name: np.broadcast_to(values[name], shape) for name in GREEKS}, strikes, maturities)
+
+
+class _Market:
+    """
+    One BlackScholesMertonProcess over mutable quotes, priced with an engine built from it.
+    """
+
+    def __init__(self, spot, rate, dividend, engine_factory, day_count):
+        self.vol_quote = ql.SimpleQuote(0.0)
+        calendar = ql.NullCalendar()
+        process = ql.BlackScholesMertonProcess(
+            ql.QuoteHandle(ql.SimpleQuote(spot)),
+            ql.YieldTermStructureHandle(ql.FlatForward(0, calendar, dividend, day_count)),
+            ql.YieldTermStructureHandle(ql.FlatForward(0, calendar, rate, day_count)),
+            ql.BlackVolTermStructureHandle(ql.BlackConstantVol(0, calendar, ql.QuoteHandle(self.vol_quote), day_count)))
+        self.engine = engine_factory(process)
+
+    def column(self, option_type, strikes, maturity, vols):
+        """
+        Greeks of every strike at one maturity; greeks the engine does not provide are NaN.
+        """
+        column = np.full((len(GREEKS), len(strikes)), np.nan)
+        exercise = ql.EuropeanExercise(maturity)
+        for i, (strike, vol) in enumerate(zip(strikes, vols)):
+            self.vol_quote.setValue(vol)
+            option = ql.VanillaOption(ql.PlainVanillaPayoff(option_type, strike), exercise)
+            option.setPricingEngine(self.engine)
+            for g, name in enumerate(GREEKS):
+                try:
+                    column[g, i] = option.NPV() if name == 'npv' else getattr(option, name)()
+                except RuntimeError:
+                    pass
+        return column
+
+
+def _init_worker(evaluation_serial, spot, rate, dividend, engine_factory, day_count_name):
+    global _worker_market
+    ql.Settings.instance().evaluationDate = ql.Date(evaluation_serial)
+    _worker_market = _Market(spot, rate, dividend, engine_factory, _day_counters[day_count_name]())
+
+
+def _column_task(args):
+    option_type, strikes, maturity_serial, vols = args
+    return _worker_market.column(option_type, strikes, ql.Date(maturity_serial), vols)
+
+
+def engine_greeks_surface(strikes, maturities, spot, rate, dividend, vol, option_type=ql.Option.Call,
+                          engine_factory=ql.AnalyticEuropeanEngine, day_count=None, max_workers=1):
+    """
+    Same surfaces as greeks_surface, priced option by option with a QuantLib engine.
+
+    For engines without a closed form (finite differences, trees, ...). Each
+    worker builds the process and engine once and prices whole maturity
+    columns. The default AnalyticEuropeanEngine serves to validate greeks_surface.
+
+    Args:
+    engine_factory (callable): Builds a pricing engine from a ql.BlackScholesMertonProcess;
+        must be picklable (a QuantLib engine class or module-level function) to use max_workers
+    max_workers (int): Processes to spread maturities across; None uses os.cpu_count(), 1 runs in-process.
+        Workers only support the day counters in _day_counters; in-process any day counter works
+    Other arguments are as for greeks_surface.
+
+    Returns:
+    dict: Greek name -> pd.DataFrame indexed by strike with one column per maturity
+    """
+    day_count = day_count if day_count is not None else ql.Actual365Fixed()
+    strikes = np.asarray(strikes, dtype=float)
+    vols = np.broadcast_to(np.asarray(vol, dtype=float), (len(strikes), len(maturities)))
+    tasks = [(option_type, strikes.tolist(), m.serialNumber(), vols[:, j].tolist()) for j, m in enumerate(maturities)]
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        market = _Market(spot, rate, dividend, engine_factory, day_count)
+        columns = [market.column(t, k, ql.Date(m), v) for t, k, m, v in tasks]
+    else:
+        # Only the process pool needs the day counter rebuilt from its name
+        if day_count.name() not in _day_counters:
+            raise ValueError(f"unsupported day counter with max_workers > 1: {day_count.name()}")
+        initargs = (ql.Settings.instance().evaluationDate.serialNumber(), spot, rate, dividend,
+                    engine_factory, day_count.name())
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=initargs) as pool:
+            columns = list(pool.map(_column_task, tasks, chunksize=max(1, len(tasks) // (4 * max_workers))))
+
+    grid = np.stack(columns, axis=2) if columns else np.empty((len(GREEKS), len(strikes), 0))
+    return _frames({name: grid[g] for g, name in enumerate(GREEKS)}, strikes, maturities)
+
+
+def surface_errors(surface, reference):
+    """
+    Largest absolute difference per greek between two surfaces, ignoring NaNs.
+
+    Returns:
+    dict: Greek name -> float
+    """
+    return {name: float(np.nanmax(np.abs(surface[name].to_numpy() - reference[name].to_numpy()), initial=0.0))
+            for name in GREEKS if name in surface and name in reference}
@@ -0,0 +1,119 @@
+import numpy as np
+import QuantLib as ql
+from scipy.special import ndtr
+
+_SQRT_2PI = np.sqrt(2.0 * np.pi)
+
+
+def _year_fractions(maturities, day_count):
+    today = ql.Settings.instance().evaluationDate
+    return np.array([day_count.yearFraction(today, m) if isinstance(m, ql.Date) else float(m)
+                     for m in maturities])
+
+
+def _black(phi, forward, strike, discount, vol, sqrt_t):
+    std_dev = vol * sqrt_t
+    d1 = np.log(forward / strike) / std_dev + 0.5 * std_dev
+    d2 = d1 - std_dev
+    price = discount * phi * (forward * ndtr(phi * d1) - strike * ndtr(phi * d2))
+    vega = discount * forward * np.exp(-0.5 * d1 * d1) / _SQRT_2PI * sqrt_t
+    return price, vega
+
+
+def implied_volatility(prices, option_types, strikes, maturities, spot, rate, dividend, day_count=None,
+                       price_tolerance=1e-10, vol_tolerance=1e-12, max_iterations=100, min_vol=1e-6, max_vol=5.0):
+    """
+    Black-Scholes-Merton implied volatilities for whole option chains at once.
+
+    The market is the BlackScholesMertonProcess of qlib_model_creation.py
+    (spot, flat risk-free and dividend curves, one day counter). Each option
+    runs a safeguarded Newton iteration: the root is kept bracketed in
+    [min_vol, max_vol] and any step leaving the bracket, or taken with a
+    vanishing vega, falls back to bisection. Options drop out of the working
+    set as they converge, so later iterations only touch the stragglers.
+    Where vega is negligible (deep in the money, almost no time value) the
+    premium barely depends on vol and the result is only as good as
+    price_tolerance.
+
+    Args:
+    prices (array-like): Option premiums
+    option_types (array-like): ql.Option.Call (1) or ql.Option.Put (-1) per option
+    strikes (array-like): Strike of each option
+    maturities (list or np.ndarray): ql.Date maturities, or times to expiry in years
+    spot (float or array-like): Spot price of the underlying
+    rate (float or array-like): Flat risk-free rate
+    dividend (float or array-like): Flat dividend yield
+    day_count (ql.DayCounter): Converts ql.Date maturities to years, Actual365Fixed by default
+    price_tolerance (float): Absolute price error accepted as converged
+    vol_tolerance (float): Bracket width accepted as converged
+    max_iterations (int): Iterations before giving up on an option
+    min_vol (float): Lower end of the search bracket
+    max_vol (float): Upper end of the search bracket
+
+    Returns:
+    tuple: (vols, converged, iterations) arrays; vols are NaN where the
+        premium is outside its no-arbitrage bounds, needs a vol outside
+        [min_vol, max_vol] or the solver did not converge
+    """
+    day_count = day_count if day_count is not None else ql.Actual365Fixed()
+    if isinstance(maturities, np.ndarray):
+        expiry = maturities.astype(float)
+    else:
+        expiry = _year_fractions(maturities, day_count)
+    target, phi, strike, expiry, spot, rate, dividend = np.broadcast_arrays(
+        np.asarray(prices, dtype=float), np.asarray(option_types, dtype=float),
+        np.asarray(strikes, dtype=float), expiry, np.asarray(spot, dtype=float),
+        np.asarray(rate, dtype=float), np.asarray(dividend, dtype=float))
+    shape = target.shape
+    target, phi, strike, expiry = target.ravel(), phi.ravel(), strike.ravel(), expiry.ravel()
+    discount = np.exp(-rate.ravel() * expiry)
+    forward = spot.ravel() * np.exp(-dividend.ravel() * expiry) / discount
+    sqrt_t = np.sqrt(np.maximum(expiry, 0.0))
+
+    vols = np.full(target.shape, np.nan)
+    converged = np.zeros(target.shape, dtype=bool)
+    iterations = np.zeros(target.shape, dtype=np.int32)
+
+    # Premiums must lie strictly between intrinsic value and the forward (call) or strike (put) bound
+    intrinsic = discount * np.maximum(phi * (forward - strike), 0.0)
+    upper = discount * np.where(phi > 0, forward, strike)
+    active = np.flatnonzero((expiry > 0) & (target > intrinsic) & (target < upper))
+    if len(active) == 0:
+        return vols.reshape(shape), converged.reshape(shape), iterations.reshape(shape)
+
+    # The root must lie in the search bracket, or collapsing the bracket onto an end would pass for convergence
+    with np.errstate(divide='ignore', invalid='ignore'):
+        floor, _ = _black(phi[active], forward[active], strike[active], discount[active], float(min_vol), sqrt_t[active])
+        cap, _ = _black(phi[active], forward[active], strike[active], discount[active], float(max_vol), sqrt_t[active])
+    active = active[(floor - price_tolerance <= target[active]) & (target[active] <= cap + price_tolerance)]
+    if len(active) == 0:
+        return vols.reshape(shape), converged.reshape(shape), iterations.reshape(shape)
+
+    lo = np.full(len(active), float(min_vol))
+    hi = np.full(len(active), float(max_vol))
+    # Manaster-Koehler start: the inflection point of price in vol, from which Newton is monotone
+    with np.errstate(divide='ignore'):
+        vol = np.sqrt(2.0 * np.abs(np.log(forward[active] / strike[active])) / expiry[active])
+    vol = np.clip(np.where(vol > 0, vol, 0.2), min_vol, max_vol)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        for iteration in range(1, max_iterations + 1):
+            price, vega = _black(phi[active], forward[active], strike[active], discount[active], vol, sqrt_t[active])
+            diff = price - target[active]
+            done = (np.abs(diff) <= price_tolerance) | (hi - lo <= vol_tolerance)
+            iterations[active] = iteration
+            if np.any(done):
+                vols[active[done]] = vol[done]
+                converged[active[done]] = True
+                keep = ~done
+                active, vol, lo, hi, diff, vega = active[keep], vol[keep], lo[keep], hi[keep], diff[keep], vega[keep]
+                if len(active) == 0:
+                    break
+
+            # Price increases with vol, so the sign of the error tightens the bracket
+            above = diff > 0
+            hi = np.where(above, vol, hi)
+            lo = np.where(above, lo, vol)
+            step = vol - diff / vega
+            vol = np.where((step > lo) & (step < hi) & (vega > 0), step, 0.5 * (lo + hi))
+    return vols.reshape(shape), converged.reshape(shape), iterations.reshape(shape)
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import talib
+
+from talib_bond_price_analyze import (BBANDS_NBDEV, BBANDS_PERIOD, MACD_PERIODS, RSI_OVERBOUGHT, RSI_OVERSOLD,
+                                      RSI_PERIOD, SIGNAL_RULES, SIGNAL_RULES_VERSION, SMA_PERIODS,
+                                      calculate_indicators, generate_signals)
+
+# What calculate_indicators computes; part of every key so a change of parameters
+# or of the TA-Lib build never serves stale results
+INDICATOR_PARAMS = {
+    'rsi_period': RSI_PERIOD,
+    'sma_periods': list(SMA_PERIODS),
+    'macd_periods': list(MACD_PERIODS),
+    'bbands_period': BBANDS_PERIOD,
+    'bbands_nbdev': BBANDS_NBDEV,
+    'ta_lib': talib.__ta_version__.decode() if isinstance(talib.__ta_version__, bytes) else str(talib.__ta_version__),
+}
+# The same for generate_signals: its thresholds, rule priorities and rule logic version
+SIGNAL_PARAMS = {
+    'rsi_oversold': RSI_OVERSOLD,
+    'rsi_overbought': RSI_OVERBOUGHT,
+    'rules': list(SIGNAL_RULES),
+    'rules_version': SIGNAL_RULES_VERSION,
+}
+INDICATOR_COLUMNS = ('RSI',) + tuple(f'SMA_{period}' for period in SMA_PERIODS) + (
+    'MACD', 'MACD_Signal', 'MACD_Hist', 'Upper', 'Middle', 'Lower')
+SIGNAL_INPUTS = ('Price', 'RSI', 'SMA_20', 'SMA_50', 'MACD', 'MACD_Signal', 'Upper', 'Lower')
+
+
+def array_key(stage, arrays, params=None):
+    """
+    Content hash of some arrays, the stage computing from them and its parameters.
+
+    Returns:
+    str: Hex digest naming the cache entry
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([stage, params], sort_keys=True).encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f'{array.dtype.str}{array.shape}'.encode())
+        digest.update(memoryview(array).cast('B'))
+    return digest.hexdigest()
+
+
+class IndicatorCache:
+    """
+    Content-addressed on-disk cache for calculate_indicators and generate_signals.
+
+    Results are keyed by a hash of the input columns and the indicator or
+    signal parameters, so any series seen before is served from disk whatever its
+    index or where it came from. Each entry is one column-major .npy file
+    that is memory-mapped on a hit, and the columns of the returned frame
+    are read-only views of that map. Once the cache holds more than
+    max_bytes, least recently used entries are deleted.
+
+    Args:
+    root (str): Directory holding the cache, created if needed
+    max_bytes (int): Size the cache is trimmed back to after each store
+    params (dict): Indicator parameters folded into the keys, INDICATOR_PARAMS by default
+    signal_params (dict): Signal parameters folded into the keys, SIGNAL_PARAMS by default
+    """
+
+    def __init__(self, root, max_bytes=1 << 30, params=None, signal_params=None):
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self.root = root
+        self.max_bytes = max_bytes
+        self.params = dict(INDICATOR_PARAMS if params is None else params)
+        self.signal_params = dict(SIGNAL_PARAMS if signal_params is None else signal_params)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.root, f'{key}.npy')
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.root) as it:
+            for entry in it:
+                if entry.name.endswith('.npy') and entry.is_file():
+                    st = entry.stat()
+                    entries.append((st.st_mtime_ns, st.st_size, entry.path))
+        return entries
+
+    def _load(self, key):
+        path = self._path(key)
+        try:
+            values = np.load(path, mmap_mode='r')
+        except (FileNotFoundError, ValueError):
+            self.misses += 1
+            return None
+        # The modification time doubles as the last use for eviction
+        os.utime(path)
+        self.hits += 1
+        return values
+
+    def _store(self, key, values):
+        # Written to a temporary file and renamed so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, np.asfortranarray(values))
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self._evict(keep=self._path(key))
+
+    def _evict(self, keep=None):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            self.evictions += 1
+
+    @staticmethod
+    def _with_columns(df, values, columns):
+        # Concatenating keeps the memory-mapped columns as views instead of copying them in;
+        # np.asarray makes those plain ndarrays rather than np.memmap
+        values = np.asarray(values)
+        cached = pd.DataFrame({c: values[:, j] for j, c in enumerate(columns)}, index=df.index, copy=False)
+        return pd.concat([df.drop(columns=[c for c in columns if c in df.columns]), cached], axis=1)
+
+    def calculate_indicators(self, df):
+        """
+        calculate_indicators, served from the cache when the prices were seen before.
+
+        Unlike calculate_indicators this returns a new frame rather than
+        adding the columns to df in place.
+        """
+        price = df['Price'].to_numpy()
+        key = array_key('indicators', [price], self.params)
+        values = self._load(key)
+        if values is None:
+            df = calculate_indicators(df.copy())
+            self._store(key, df[list(INDICATOR_COLUMNS)].to_numpy(dtype=float))
+            return df
+        return self._with_columns(df, values, INDICATOR_COLUMNS)
+
+    def generate_signals(self, df):
+        """
+        generate_signals, served from the cache when its input columns were seen before.
+
+        Returns a new frame rather than adding the Signal column to df in place.
+        """
+        key = array_key('signals', [df[c].to_numpy() for c in SIGNAL_INPUTS], self.signal_params)
+        values = self._load(key)
+        if values is None:
+            df = generate_signals(df.copy())
+            self._store(key, df['Signal'].to_numpy()[:, None])
+            return df
+        return self._with_columns(df, values, ('Signal',))
+
+    def clear(self):
+        """
+        Deletes every entry.
+
+        Returns:
+        int: Number of entries removed
+        """
+        removed = 0
+        for _, _, path in self._entries():
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def stats(self):
+        entries = self._entries()
+        return {
+            'entries': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
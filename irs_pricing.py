@@ -1,5 +1,7 @@
 import QuantLib as ql
 
+from schedule_cache import schedule_cache
+
 # 1. Set up the environment and define market data:
 
 # Set the evaluation date
@@ -28,13 +30,11 @@ libor_curve = ql.YieldTermStructureHandle(
 # Use Euribor 3M as the floating rate index
 index = ql.Euribor3M(libor_curve)
 
-# Add historical fixings
+# Add historical fixings in one bulk call (see fixing_store.py for long histories)
 fixing_calendar = index.fixingCalendar()
-for i in range(1, 8):
-    fixing_date = today - ql.Period(i, ql.Days)
-    if index.isValidFixingDate(fixing_date):
-        adjusted_fixing_date = fixing_calendar.adjust(fixing_date)
-        index.addFixing(adjusted_fixing_date, libor_rate)
+fixing_dates = [fixing_calendar.adjust(today - ql.Period(i, ql.Days)) for i in range(7, 0, -1)
+                if index.isValidFixingDate(today - ql.Period(i, ql.Days))]
+index.addFixings(fixing_dates, [libor_rate] * len(fixing_dates))
 
 # 4. Set up swap parameters:
 
@@ -47,7 +47,7 @@ float_leg_tenor = ql.Period(3, ql.Months)
 # 5. Create schedules for fixed and floating legs:
 
 # Schedule for the fixed leg
-fixed_schedule = ql.Schedule(
+fixed_schedule = schedule_cache.schedule(
     today,
     maturity_date,
     fixed_leg_tenor,
@@ -59,7 +59,7 @@ fixed_schedule = ql.Schedule(
 )
 
 # Schedule for the floating leg
-float_schedule = ql.Schedule(
+float_schedule = schedule_cache.schedule(
     today,
     maturity_date,
     float_leg_tenor,
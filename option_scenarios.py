@@ -0,0 +1,102 @@
+import numpy as np
+import QuantLib as ql
+
+RISK_FACTORS = ('spot', 'rate', 'dividend', 'vol')
+
+
+class QuoteScenarioEngine:
+    """
+    Revalues a book of options under scenario grids by bumping market quotes in place.
+
+    One Black-Scholes-Merton process is built over SimpleQuotes for spot,
+    risk-free rate, dividend yield and volatility, with flat curves and a
+    constant vol as in qlib_risk_analysis.py. Options share one
+    AnalyticEuropeanEngine on that process, so a scenario only sets the
+    quotes that changed since the previous point and lets QuantLib's lazy
+    recalculation do the rest.
+
+    Args:
+    spot (float): Spot price of the underlying
+    rate (float): Flat risk-free rate
+    dividend (float): Flat dividend yield
+    vol (float): Constant Black volatility
+    day_count (ql.DayCounter): Day count of the curves, Actual365Fixed by default
+    calendar (ql.Calendar): Calendar of the curves, TARGET by default
+    """
+
+    def __init__(self, spot, rate, dividend, vol, day_count=None, calendar=None):
+        day_count = day_count if day_count is not None else ql.Actual365Fixed()
+        calendar = calendar if calendar is not None else ql.TARGET()
+        self.quotes = {
+            'spot': ql.SimpleQuote(spot),
+            'rate': ql.SimpleQuote(rate),
+            'dividend': ql.SimpleQuote(dividend),
+            'vol': ql.SimpleQuote(vol),
+        }
+        handles = {name: ql.QuoteHandle(quote) for name, quote in self.quotes.items()}
+        riskfreerate_handle = ql.YieldTermStructureHandle(ql.FlatForward(0, calendar, handles['rate'], day_count))
+        dividend_handle = ql.YieldTermStructureHandle(ql.FlatForward(0, calendar, handles['dividend'], day_count))
+        volatility_handle = ql.BlackVolTermStructureHandle(ql.BlackConstantVol(0, calendar, handles['vol'], day_count))
+        self.process = ql.BlackScholesMertonProcess(handles['spot'], dividend_handle, riskfreerate_handle,
+                                                    volatility_handle)
+        self.engine = ql.AnalyticEuropeanEngine(self.process)
+        self.options = []
+        self.quantities = []
+
+    def add_option(self, option, quantity=1.0):
+        """
+        Prices option off the engine's process and includes it in the book.
+
+        Returns:
+        int: Position of the option in the book
+        """
+        option.setPricingEngine(self.engine)
+        self.options.append(option)
+        self.quantities.append(float(quantity))
+        return len(self.options) - 1
+
+    def value(self):
+        """
+        Returns the book value at the current quotes.
+        """
+        return sum(quantity * option.NPV() for option, quantity in zip(self.options, self.quantities))
+
+    def evaluate(self, **axes):
+        """
+        Values the book on the full grid spanned by the given risk factor axes.
+
+        Factors not given stay at their current quote. Points are visited
+        with the last axis varying fastest, so outer factors are only reset
+        when their index moves. Quotes are restored afterwards.
+
+        Args:
+        **axes: Risk factor name ('spot', 'rate', 'dividend' or 'vol') ->
+            1-d array of levels, in the order the result axes should take
+
+        Returns:
+        np.ndarray: Book value with shape (len(axis) for axis in axes)
+        """
+        unknown = set(axes) - set(RISK_FACTORS)
+        if unknown:
+            raise ValueError(f"unknown risk factors: {sorted(unknown)}; expected some of {RISK_FACTORS}")
+        names = list(axes)
+        levels = [np.asarray(axes[name], dtype=float).ravel().tolist() for name in names]
+        quotes = [self.quotes[name] for name in names]
+        shape = tuple(len(axis) for axis in levels)
+        values = np.empty(int(np.prod(shape, dtype=np.int64)))
+        if values.size == 0:
+            return values.reshape(shape)
+
+        original = [quote.value() for quote in quotes]
+        current = [None] * len(names)
+        try:
+            for flat, point in enumerate(np.ndindex(*shape)):
+                for k, i in enumerate(point):
+                    if current[k] != i:
+                        quotes[k].setValue(levels[k][i])
+                        current[k] = i
+                values[flat] = self.value()
+        finally:
+            for quote, value in zip(quotes, original):
+                quote.setValue(value)
+        return values.reshape(shape)
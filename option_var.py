@@ -0,0 +1,182 @@
+import time
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+from black_scholes import black_scholes_price
+
+RISK_FACTORS = ('spot', 'vol', 'rate')
+
+
+def _year_fraction(maturity, day_count, today):
+    if isinstance(maturity, ql.Date):
+        return day_count.yearFraction(today, maturity)
+    return float(maturity)
+
+
+def _tail_measures(pnl, confidence):
+    cutoff = np.quantile(pnl, 1.0 - confidence)
+    return -cutoff, -pnl[pnl <= cutoff].mean()
+
+
+class OptionVaREngine:
+    """
+    Value at Risk and Expected Shortfall for a book of European options.
+
+    Scenarios move spot, volatility and the risk-free rate and are generated
+    and repriced chunk by chunk with closed-form Black-Scholes-Merton prices,
+    so memory is bounded by chunk_size x options plus the worst
+    (1 - confidence) share of the scenario P&Ls, which is all VaR and ES
+    need; the full P&L vector is only kept when asked for.
+    Spot and vol shocks are log changes, rate shocks are absolute changes.
+
+    Args:
+    option_types (array-like): ql.Option.Call or ql.Option.Put per option
+    strikes (array-like): Strike of each option
+    maturities (list): ql.Date maturity, or time to expiry in years, per option
+    quantities (array-like): Number of options held, negative for short positions
+    spot (float): Spot price of the underlying
+    rate (float): Flat risk-free rate
+    dividend (float): Flat dividend yield
+    vol (float): Black volatility
+    day_count (ql.DayCounter): Converts maturities to year fractions, Actual365Fixed by default
+    """
+
+    def __init__(self, option_types, strikes, maturities, quantities, spot, rate, dividend, vol, day_count=None):
+        day_count = day_count if day_count is not None else ql.Actual365Fixed()
+        today = ql.Settings.instance().evaluationDate
+        self.option_types = np.asarray(option_types, dtype=float)
+        self.strikes = np.asarray(strikes, dtype=float)
+        self.expiries = np.array([_year_fraction(m, day_count, today) for m in maturities])
+        self.quantities = np.asarray(quantities, dtype=float)
+        if not (len(self.option_types) == len(self.strikes) == len(self.expiries) == len(self.quantities)):
+            raise ValueError("option_types, strikes, maturities and quantities must have the same length")
+        self.spot = float(spot)
+        self.rate = float(rate)
+        self.dividend = float(dividend)
+        self.vol = float(vol)
+        self.base_value = float(self.value(self.spot, self.rate, self.vol))
+
+    def value(self, spot, rate, vol, horizon=0.0):
+        """
+        Book value for arrays of scenario spot, rate and vol levels.
+
+        Args:
+        horizon (float): Years the options have aged by in the scenarios
+
+        Returns:
+        np.ndarray: Book value per scenario
+        """
+        prices = black_scholes_price(self.option_types, np.asarray(spot, dtype=float)[..., None], self.strikes,
+                                     self.expiries - horizon, np.asarray(rate, dtype=float)[..., None],
+                                     self.dividend, np.asarray(vol, dtype=float)[..., None])
+        return prices @ self.quantities
+
+    def _run(self, shock_chunks, n_scenarios, horizon, confidence, on_chunk, keep_pnl):
+        if n_scenarios == 0:
+            raise ValueError("no scenarios to evaluate")
+        # np.quantile's linear interpolation only looks at the order statistics around this rank
+        rank = (n_scenarios - 1) * (1.0 - confidence)
+        n_worst = min(n_scenarios, int(rank) + 2)
+        worst = np.empty(0)
+        pnl_chunks = []
+        rows = []
+        start = time.perf_counter()
+        for i, shocks in enumerate(shock_chunks):
+            chunk_start = time.perf_counter()
+            spot = self.spot * np.exp(shocks[:, 0])
+            vol = self.vol * np.exp(shocks[:, 1])
+            rate = self.rate + shocks[:, 2]
+            pnl = self.value(spot, rate, vol, horizon) - self.base_value
+            var, es = _tail_measures(pnl, confidence)
+            row = {'chunk': i, 'scenarios': len(pnl), 'var': var, 'es': es,
+                   'runtime': time.perf_counter() - chunk_start}
+            rows.append(row)
+            # Keep the n_worst smallest P&Ls seen so far, and any ties with the largest of them
+            worst = np.concatenate([worst, pnl])
+            if len(worst) > n_worst:
+                worst = worst[worst <= np.partition(worst, n_worst - 1)[n_worst - 1]]
+            if keep_pnl:
+                pnl_chunks.append(pnl)
+            if on_chunk is not None:
+                on_chunk(row)
+
+        worst.sort()
+        lo = int(rank)
+        hi = min(lo + 1, len(worst) - 1)
+        weight = rank - lo
+        # Same interpolation as np.quantile over all the scenarios
+        step = worst[hi] - worst[lo]
+        cutoff = worst[lo] + step * weight if weight < 0.5 else worst[hi] - step * (1.0 - weight)
+        result = {
+            'var': -cutoff,
+            'es': -worst[worst <= cutoff].mean(),
+            'confidence': confidence,
+            'scenarios': n_scenarios,
+            'runtime': time.perf_counter() - start,
+            'chunks': pd.DataFrame(rows).set_index('chunk'),
+        }
+        if keep_pnl:
+            result['pnl'] = np.concatenate(pnl_chunks)
+        return result
+
+    def monte_carlo(self, n_scenarios, factor_vols, correlation=None, horizon_days=1, confidence=0.95,
+                    chunk_size=100_000, seed=None, on_chunk=None, keep_pnl=False):
+        """
+        Monte Carlo VaR and ES from correlated normal risk factor shocks.
+
+        Args:
+        n_scenarios (int): Number of scenarios
+        factor_vols (sequence): Annualized volatility of the spot log return, vol log
+            change and absolute rate change, in that order
+        correlation (array-like): 3x3 correlation of the shocks, identity by default
+        horizon_days (int): Calendar days the shocks span; options age by as much
+        confidence (float): VaR confidence level
+        chunk_size (int): Scenarios generated and repriced at a time
+        seed (int): Seed for np.random.default_rng
+        on_chunk (callable): Called with each chunk's report as it completes
+        keep_pnl (bool): Also return the P&L of every scenario, using O(n_scenarios) memory
+
+        Returns:
+        dict: 'var', 'es' (positive losses), 'confidence', 'scenarios',
+            'runtime' and 'chunks', a DataFrame of scenarios, var, es and
+            runtime per chunk; with keep_pnl, also 'pnl' per scenario
+        """
+        correlation = np.eye(3) if correlation is None else np.asarray(correlation, dtype=float)
+        horizon = horizon_days / 365.0
+        scale = np.linalg.cholesky(correlation).T * (np.asarray(factor_vols, dtype=float) * np.sqrt(horizon))
+        rng = np.random.default_rng(seed)
+
+        def shock_chunks():
+            for first in range(0, n_scenarios, chunk_size):
+                yield rng.standard_normal((min(chunk_size, n_scenarios - first), 3)) @ scale
+
+        return self._run(shock_chunks(), n_scenarios, horizon, confidence, on_chunk, keep_pnl)
+
+    def historical(self, returns, horizon_days=1, confidence=0.95, chunk_size=100_000, on_chunk=None,
+                   keep_pnl=False):
+        """
+        Historical-simulation VaR and ES, one scenario per row of past shocks.
+
+        Args:
+        returns (pd.DataFrame or str): Shocks over horizon_days, or the path of
+            a CSV holding them; column 'spot' holds log returns and the optional
+            'vol' (log changes) and 'rate' (absolute changes) default to 0
+        horizon_days (int): Calendar days each row spans; options age by as much
+        confidence (float): VaR confidence level
+        chunk_size (int): Rows repriced at a time
+        on_chunk (callable): Called with each chunk's report as it completes
+        keep_pnl (bool): Also return the P&L of every scenario
+
+        Returns:
+        dict: As monte_carlo
+        """
+        if isinstance(returns, str):
+            returns = pd.read_csv(returns)
+        if 'spot' not in returns:
+            raise ValueError("returns must have a 'spot' column")
+        shocks = np.column_stack([returns[name].to_numpy(dtype=float) if name in returns
+                                  else np.zeros(len(returns)) for name in RISK_FACTORS])
+        chunks = (shocks[first:first + chunk_size] for first in range(0, len(shocks), chunk_size))
+        return self._run(chunks, len(shocks), horizon_days / 365.0, confidence, on_chunk, keep_pnl)
@@ -0,0 +1,173 @@
+import numpy as np
+
+
+def _numeric(x):
+    # LTTB needs x as numbers; datetimes become nanoseconds
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype('datetime64[ns]').view(np.int64)
+    x = x.astype(float)
+    return x - x[0] if len(x) else x
+
+
+def minmax_indices(y, n_buckets):
+    """
+    Indices of the smallest and largest value of each of n_buckets equal runs of y.
+
+    Keeping both extremes of every bucket preserves the envelope a line plot
+    draws at one bucket per pixel column. The first and last points are
+    always kept; NaNs are only chosen when a whole bucket is NaN, so gaps
+    stay visible.
+
+    Returns:
+    np.ndarray: Sorted indices into y
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_buckets < 1 or 2 * n_buckets + 2 >= n:
+        return np.arange(n)
+    width = -(-n // n_buckets)
+    n_buckets = -(-n // width)
+    padded = np.full(n_buckets * width, np.nan)
+    padded[:n] = y
+    nan = np.isnan(padded)
+    starts = np.arange(0, n_buckets * width, width)
+    lows = starts + np.where(nan, np.inf, padded).reshape(n_buckets, width).argmin(axis=1)
+    highs = starts + np.where(nan, -np.inf, padded).reshape(n_buckets, width).argmax(axis=1)
+    return np.unique(np.concatenate([[0, n - 1], np.minimum(lows, n - 1), np.minimum(highs, n - 1)]))
+
+
+def lttb_indices(x, y, n_out):
+    """
+    Indices of the n_out points Largest-Triangle-Three-Buckets keeps of (x, y).
+
+    Each bucket between the fixed first and last points keeps the point
+    forming the largest triangle with the previously kept point and the
+    average of the next bucket, which follows the shape of the series better
+    than even sampling. NaN points are only kept when a bucket has nothing else.
+
+    Returns:
+    np.ndarray: Sorted indices into y
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out < 3 or n_out >= n:
+        return np.arange(n)
+    x = _numeric(x)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Averages of every bucket, the last "bucket" being the final point
+    finite = ~np.isnan(y)
+    counts = np.add.reduceat(finite[:-1].astype(float), edges[:-1])
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_y = np.add.reduceat(np.where(finite, y, 0.0)[:-1], edges[:-1]) / counts
+    mean_x = np.add.reduceat(x[:-1], edges[:-1]) / np.diff(edges)
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - mean_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (mean_y[i] - y[a]))
+        a = lo + int(np.argmax(np.where(np.isnan(area), -1.0, area)))
+        indices[i + 1] = a
+    return indices
+
+
+def downsample_indices(x, y, max_points, method='minmax'):
+    """
+    Indices of at most about max_points points of (x, y) that keep its visual shape.
+
+    Args:
+    method (str): 'minmax' (extremes of each bucket, exact envelope) or 'lttb'
+
+    Returns:
+    np.ndarray: Sorted indices into y
+    """
+    if method == 'minmax':
+        return minmax_indices(y, max_points // 2)
+    if method == 'lttb':
+        return lttb_indices(x, y, max_points)
+    raise ValueError(f"unknown downsampling method: {method}")
+
+
+def pixel_budget(ax):
+    """
+    Width of an axes in device pixels, the most points a line can usefully show.
+    """
+    return max(int(ax.get_window_extent().width), 1)
+
+
+def plot_line(ax, x, y, *args, max_points=None, method='minmax', **kwargs):
+    """
+    ax.plot of (x, y) downsampled to max_points, by default twice the pixel width of ax.
+
+    Returns:
+    list: Lines added by ax.plot
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    max_points = max_points if max_points is not None else 2 * pixel_budget(ax)
+    index = downsample_indices(x, y, max_points, method)
+    return ax.plot(x[index], y[index], *args, **kwargs)
+
+
+def fill_band(ax, x, upper, lower, max_points=None, method='minmax', **kwargs):
+    """
+    ax.fill_between of a band, keeping the points either edge needs.
+    """
+    x, upper, lower = np.asarray(x), np.asarray(upper), np.asarray(lower)
+    max_points = max_points if max_points is not None else 2 * pixel_budget(ax)
+    index = np.union1d(downsample_indices(x, upper, max_points, method),
+                       downsample_indices(x, lower, max_points, method))
+    return ax.fill_between(x[index], upper[index], lower[index], **kwargs)
+
+
+def marker_indices(x, y, width, height):
+    """
+    Indices of one point per cell of a width x height grid over the data range.
+
+    Markers sharing a pixel cell draw on top of each other, so this keeps
+    every marker position that can be seen while dropping the overdraw.
+
+    Returns:
+    np.ndarray: Sorted indices into y
+    """
+    x, y = _numeric(x), np.asarray(y, dtype=float)
+    keep = np.flatnonzero(~np.isnan(y))
+    if len(keep) <= 1:
+        return keep
+    cells = []
+    for values, size in ((x[keep], width), (y[keep], height)):
+        lo, hi = values.min(), values.max()
+        scale = (size - 1) / (hi - lo) if hi > lo else 0.0
+        cells.append(((values - lo) * scale).astype(np.int64))
+    _, first = np.unique(cells[0] * height + cells[1], return_index=True)
+    return np.sort(keep[first])
+
+
+def plot_markers(ax, x, y, **kwargs):
+    """
+    ax.scatter of (x, y) with at most one marker per pixel of ax.
+
+    Returns:
+    PathCollection: Markers added by ax.scatter
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    extent = ax.get_window_extent()
+    index = marker_indices(x, y, max(int(extent.width), 1), max(int(extent.height), 1))
+    return ax.scatter(x[index], y[index], **kwargs)
+
+
+def new_figure(headless, **kwargs):
+    """
+    A figure from pyplot, or with headless a bare Figure that only renders to files.
+
+    The headless figure never touches pyplot, so no interactive backend is
+    imported; Figure.savefig renders it with Agg.
+    """
+    if headless:
+        from matplotlib.figure import Figure
+        return Figure(**kwargs)
+    import matplotlib.pyplot as plt
+    return plt.figure(**kwargs)
@@ -5,6 +5,9 @@
 import QuantLib as ql
 import numpy as np
 
+from option_scenarios import QuoteScenarioEngine
+from option_var import OptionVaREngine
+
 
 # 2.  Define market data and parameters:
 
@@ -61,26 +64,23 @@ theta = european_option.theta()
 # 6.  Perform sensitivity analysis:
 
 
-def calculate_price(spot):
-    new_spot_handle = ql.QuoteHandle(ql.SimpleQuote(spot))
-    new_process = ql.BlackScholesMertonProcess(new_spot_handle, dividend_handle, riskfreerate_handle, volatility_handle)
-    new_engine = ql.AnalyticEuropeanEngine(new_process)
-    european_option.setPricingEngine(new_engine)
-    return european_option.NPV()
+# One process wired to mutable quotes; each grid point only bumps the spot quote
+scenarios = QuoteScenarioEngine(spot_price, risk_free_rate, dividend_yield, volatility, day_count, calendar)
+scenarios.add_option(european_option)
 
 spots = np.linspace(80, 120, 41)
-prices = [calculate_price(spot) for spot in spots]
+prices = scenarios.evaluate(spot=spots)
 
 
 # 7.  Calculate Value at Risk (VaR):
 
 
-def calculate_portfolio_value(spot):
-    return calculate_price(spot) * 1000  # Assuming 1000 options
-
-portfolio_values = [calculate_portfolio_value(spot) for spot in spots]
-changes = np.diff(portfolio_values)
-var_95 = np.percentile(changes, 5)
+# 1-day Monte Carlo VaR and ES of 1000 options under correlated spot, vol and rate shocks
+var_engine = OptionVaREngine([option_type], [strike], [maturity_date], [1000],
+                             spot_price, risk_free_rate, dividend_yield, volatility, day_count)
+risk = var_engine.monte_carlo(1_000_000, factor_vols=(volatility, 0.8, 0.01),
+                              correlation=[[1.0, -0.5, 0.0], [-0.5, 1.0, 0.0], [0.0, 0.0, 1.0]],
+                              confidence=0.95, seed=42)
 
 
 # 8.  Print results:
@@ -91,5 +91,6 @@ print(f"Delta: {delta:.4f}")
 print(f"Gamma: {gamma:.4f}")
 print(f"Vega: {vega:.4f}")
 print(f"Theta: {theta:.4f}")
-print(f"95% VaR: {-var_95:.2f}")
+print(f"95% VaR: {risk['var']:.2f}")
+print(f"95% ES: {risk['es']:.2f}")
 
@@ -1,6 +1,10 @@
 import QuantLib as ql
 import matplotlib.pyplot as plt
 
+from key_rate_durations import KeyRateDurationEngine
+from plot_downsample import plot_line
+from schedule_cache import schedule_cache
+
 # Set evaluation date
 today = ql.Date(28, 6, 2024)
 ql.Settings.instance().evaluationDate = today
@@ -23,7 +27,7 @@ spot_curve_handle = ql.YieldTermStructureHandle(spot_curve)
 
 # Plot yield curve
 plt.figure(figsize=(10, 6))
-plt.plot([spot_curve.timeFromReference(d) for d in spot_dates], spot_rates, 'o-')
+plot_line(plt.gca(), [spot_curve.timeFromReference(d) for d in spot_dates], spot_rates, 'o-')
 plt.title('Zero Coupon Yield Curve')
 plt.xlabel('Time (years)')
 plt.ylabel('Zero Rate')
@@ -38,8 +42,8 @@ calendar = ql.UnitedStates()
 business_convention = ql.Unadjusted
 date_generation = ql.DateGeneration.Backward
 month_end = False
-schedule = ql.Schedule(issue_date, maturity_date, tenor, calendar, business_convention, 
-                       business_convention, date_generation, month_end)
+schedule = schedule_cache.schedule(issue_date, maturity_date, tenor, calendar, business_convention,
+                                   business_convention, date_generation, month_end)
 
 coupon_rate = 0.04
 coupons = [coupon_rate]
@@ -58,31 +62,11 @@ bond_yield = fixed_rate_bond.yield_(day_count, ql.Compounded, ql.Annual)
 print(f"Bond Price: {bond_price:.4f}")
 print(f"Bond Yield: {bond_yield:.4%}")
 
-# Calculate key rate durations
-shifts = [0.0001] * len(spot_dates)
-key_rate_durations = []
-
-for i in range(len(spot_dates)):
-    up_rates = spot_rates.copy()
-    up_rates[i] += shifts[i]
-    down_rates = spot_rates.copy()
-    down_rates[i] -= shifts[i]
-    
-    up_curve = ql.ZeroCurve(spot_dates, up_rates, day_count, calendar, interpolation, 
-                            compounding, compounding_frequency)
-    down_curve = ql.ZeroCurve(spot_dates, down_rates, day_count, calendar, interpolation, 
-                              compounding, compounding_frequency)
-    
-    up_engine = ql.DiscountingBondEngine(ql.YieldTermStructureHandle(up_curve))
-    down_engine = ql.DiscountingBondEngine(ql.YieldTermStructureHandle(down_curve))
-    
-    fixed_rate_bond.setPricingEngine(up_engine)
-    up_price = fixed_rate_bond.NPV()
-    fixed_rate_bond.setPricingEngine(down_engine)
-    down_price = fixed_rate_bond.NPV()
-    
-    key_rate_duration = (down_price - up_price) / (2 * shifts[i] * bond_price)
-    key_rate_durations.append(key_rate_duration)
+# Calculate key rate durations by bumping quote-driven pillars in place
+krd_engine = KeyRateDurationEngine(spot_dates, spot_rates, day_count, calendar,
+                                   compounding, compounding_frequency)
+krd_engine.add_instrument(fixed_rate_bond)
+key_rate_durations = krd_engine.key_rate_durations(shift=0.0001)[0]
 
 # Plot key rate durations
 plt.figure(figsize=(10, 6))
@@ -0,0 +1,130 @@
+from collections import OrderedDict
+
+import numpy as np
+import QuantLib as ql
+
+_EPOCH_SERIAL = 25569  # ql.Date(1, 1, 1970).serialNumber()
+
+
+def schedule_key(effective_date, termination_date, tenor, calendar, convention,
+                 termination_convention, rule, end_of_month):
+    """
+    Builds the hashable tuple identifying a ql.Schedule.
+
+    Dates are reduced to serial numbers, the tenor to (length, units) and the
+    calendar to its name, so equal arguments built separately share a key.
+
+    Returns:
+    tuple: Key for ScheduleCache
+    """
+    return (
+        effective_date.serialNumber(),
+        termination_date.serialNumber(),
+        tenor.length(),
+        int(tenor.units()),
+        calendar.name(),
+        int(convention),
+        int(termination_convention),
+        int(rule),
+        bool(end_of_month),
+    )
+
+
+class ScheduleCache:
+    """
+    Bounded LRU cache interning ql.Schedule objects by their full argument tuple.
+
+    QuantLib instruments copy the schedule they are built with, so one
+    interned schedule can safely back any number of bonds or swap legs. Each
+    entry also keeps the generated dates as a read-only datetime64[D] array
+    for vectorized code.
+
+    Args:
+    maxsize (int): Maximum number of schedules kept before the least recently
+        used one is evicted
+    """
+
+    def __init__(self, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _entry(self, effective_date, termination_date, tenor, calendar, convention,
+               termination_convention, rule, end_of_month):
+        if termination_convention is None:
+            termination_convention = convention
+        key = schedule_key(effective_date, termination_date, tenor, calendar, convention,
+                           termination_convention, rule, end_of_month)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        schedule = ql.Schedule(effective_date, termination_date, tenor, calendar, convention,
+                               termination_convention, rule, end_of_month)
+        serials = np.array([d.serialNumber() for d in schedule.dates()], dtype=np.int64)
+        dates = (serials - _EPOCH_SERIAL).astype('datetime64[D]')
+        dates.flags.writeable = False
+        entry = self._entries[key] = (schedule, dates)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def schedule(self, effective_date, termination_date, tenor, calendar, convention=ql.ModifiedFollowing,
+                 termination_convention=None, rule=ql.DateGeneration.Backward, end_of_month=False):
+        """
+        Returns the interned schedule for these arguments, building it on a miss.
+
+        Arguments follow the ql.Schedule constructor; termination_convention
+        defaults to convention.
+
+        Returns:
+        ql.Schedule: Shared schedule, not to be modified
+        """
+        return self._entry(effective_date, termination_date, tenor, calendar, convention,
+                           termination_convention, rule, end_of_month)[0]
+
+    def dates(self, effective_date, termination_date, tenor, calendar, convention=ql.ModifiedFollowing,
+              termination_convention=None, rule=ql.DateGeneration.Backward, end_of_month=False):
+        """
+        Returns the dates of the interned schedule for these arguments.
+
+        Returns:
+        np.ndarray: Read-only datetime64[D] array of the schedule dates
+        """
+        return self._entry(effective_date, termination_date, tenor, calendar, convention,
+                           termination_convention, rule, end_of_month)[1]
+
+    def clear(self):
+        """
+        Drops every schedule.
+
+        Returns:
+        int: Number of schedules removed
+        """
+        removed = len(self._entries)
+        self._entries.clear()
+        return removed
+
+    def stats(self):
+        return {
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+# Process-wide cache shared by the bond and swap builders
+schedule_cache = ScheduleCache()
@@ -0,0 +1,321 @@
+import math
+import numbers
+from collections import deque
+
+import numpy as np
+from scipy.signal import lfilter
+
+from talib_bond_price_analyze import BBANDS_NBDEV, BBANDS_PERIOD, MACD_PERIODS, RSI_PERIOD, SMA_PERIODS
+
+NAN = float('nan')
+
+
+def _running_totals(values, period):
+    # TA-Lib's running window sums: each step adds the newest value, reports, then drops the
+    # oldest. np.cumsum adds sequentially, so interleaving the adds and drops rounds the same way.
+    n = len(values)
+    steps = np.empty(2 * n - period)
+    steps[:period - 1] = values[:period - 1]
+    steps[period - 1::2] = values[period - 1:]
+    steps[period::2] = -values[:n - period]
+    totals = np.cumsum(steps)
+    return totals[period - 1::2], totals[-1] - values[n - period]
+
+
+class StreamingSMA:
+    """
+    Simple moving average updated in O(1) with TA-Lib's running sum.
+    """
+
+    def __init__(self, period):
+        self.period = period
+        self._window = deque(maxlen=period)
+        self._total = 0.0
+        self.value = NAN
+
+    def update(self, price):
+        self._window.append(price)
+        self._total += price
+        if len(self._window) < self.period:
+            return NAN
+        self.value = self._total / self.period
+        self._total -= self._window[0]
+        return self.value
+
+    def warm_start(self, prices):
+        self._window.clear()
+        self._total = 0.0
+        self.value = NAN
+        if len(prices) < self.period:
+            for price in prices:
+                self.update(float(price))
+            return self.value
+        totals, self._total = _running_totals(prices, self.period)
+        self._window.extend(prices[-self.period:].tolist())
+        self.value = float(totals[-1] / self.period)
+        return self.value
+
+
+class StreamingEMA:
+    """
+    Exponential moving average with TA-Lib's seeding.
+
+    The first skip values are ignored and the next period values are
+    averaged into the seed, as TA-Lib does (MACD skips values to align its
+    fast EMA with the slow one).
+    """
+
+    def __init__(self, period, skip=0, alpha=None):
+        self.period = period
+        self.skip = skip
+        self.alpha = 2.0 / (period + 1) if alpha is None else alpha
+        self._seen = 0
+        self._total = 0.0
+        self.value = NAN
+
+    @property
+    def ready(self):
+        return self._seen >= self.skip + self.period
+
+    def update(self, price):
+        self._seen += 1
+        if self._seen <= self.skip:
+            return NAN
+        if not self.ready:
+            self._total += price
+            return NAN
+        if self._seen == self.skip + self.period:
+            self.value = (self._total + price) / self.period
+        else:
+            self.value = (price - self.value) * self.alpha + self.value
+        return self.value
+
+    def series(self, prices):
+        """
+        Batch values for prices from a fresh start, NaN until seeded, without touching the state.
+        """
+        out = np.full(len(prices), NAN)
+        seed_end = self.skip + self.period - 1
+        if len(prices) <= seed_end:
+            return out
+        seed = np.cumsum(prices[self.skip:seed_end + 1])[-1] / self.period
+        out[seed_end] = seed
+        if len(prices) > seed_end + 1:
+            out[seed_end + 1:], _ = lfilter([self.alpha], [1.0, self.alpha - 1.0], prices[seed_end + 1:],
+                                            zi=[(1.0 - self.alpha) * seed])
+        return out
+
+    def warm_start(self, prices):
+        self._seen = 0
+        self._total = 0.0
+        self.value = NAN
+        if len(prices) < self.skip + self.period:
+            for price in prices:
+                self.update(float(price))
+            return self.value
+        self._seen = len(prices)
+        self.value = float(self.series(prices)[-1])
+        return self.value
+
+
+class StreamingRSI:
+    """
+    Relative Strength Index with Wilder smoothing, as TA-Lib computes it.
+    """
+
+    def __init__(self, period=14):
+        self.period = period
+        self._seen = 0
+        self._previous = NAN
+        self._gain = 0.0
+        self._loss = 0.0
+        self.value = NAN
+
+    def _output(self):
+        total = self._gain + self._loss
+        self.value = 100.0 * (self._gain / total) if not -1e-8 < total < 1e-8 else 0.0
+        return self.value
+
+    def update(self, price):
+        self._seen += 1
+        change = price - self._previous
+        self._previous = price
+        if self._seen == 1:
+            return NAN
+        if self._seen <= self.period + 1:
+            if change < 0:
+                self._loss -= change
+            else:
+                self._gain += change
+            if self._seen < self.period + 1:
+                return NAN
+            self._loss /= self.period
+            self._gain /= self.period
+            return self._output()
+        self._loss *= self.period - 1
+        self._gain *= self.period - 1
+        if change < 0:
+            self._loss -= change
+        else:
+            self._gain += change
+        self._loss /= self.period
+        self._gain /= self.period
+        return self._output()
+
+    def warm_start(self, prices):
+        self._seen = 0
+        self._previous = NAN
+        self._gain = 0.0
+        self._loss = 0.0
+        self.value = NAN
+        if len(prices) <= self.period + 1:
+            for price in prices:
+                self.update(float(price))
+            return self.value
+        changes = np.diff(prices)
+        averages = StreamingEMA(self.period, alpha=1.0 / self.period)
+        self._gain = float(averages.series(np.maximum(changes, 0.0))[-1])
+        self._loss = float(averages.series(np.maximum(-changes, 0.0))[-1])
+        self._seen = len(prices)
+        self._previous = float(prices[-1])
+        return self._output()
+
+
+class StreamingMACD:
+    """
+    MACD line, signal line and histogram with TA-Lib's alignment.
+    """
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = StreamingEMA(fast, skip=slow - fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+        self.value = (NAN, NAN, NAN)
+
+    def update(self, price):
+        fast = self.fast.update(price)
+        slow = self.slow.update(price)
+        if not self.slow.ready:
+            return self.value
+        macd = fast - slow
+        signal = self.signal.update(macd)
+        if self.signal.ready:
+            self.value = (macd, signal, macd - signal)
+        return self.value
+
+    def warm_start(self, prices):
+        self.value = (NAN, NAN, NAN)
+        start = self.slow.period - 1
+        macd = self.fast.series(prices) - self.slow.series(prices)
+        self.fast.warm_start(prices)
+        self.slow.warm_start(prices)
+        self.signal.warm_start(macd[start:])
+        if self.signal.ready:
+            self.value = (float(macd[-1]), self.signal.value, float(macd[-1]) - self.signal.value)
+        return self.value
+
+
+class StreamingBBands:
+    """
+    Bollinger Bands around an SMA.
+
+    Like TA-Lib's, the variance is taken around the SMA over the window
+    rather than from a running sum of squares, which would lose precision
+    to cancellation; that costs O(period) per bar, still independent of
+    the history length.
+    """
+
+    def __init__(self, period=20, nbdev=2.0):
+        self.period = period
+        self.nbdev = nbdev
+        self.middle = StreamingSMA(period)
+        self.value = (NAN, NAN, NAN)
+
+    def _output(self, middle):
+        variance = 0.0
+        for price in self.middle._window:
+            variance += (price - middle) * (price - middle)
+        deviation = self.nbdev * math.sqrt(max(variance / self.period, 0.0))
+        self.value = (middle + deviation, middle, middle - deviation)
+        return self.value
+
+    def update(self, price):
+        middle = self.middle.update(price)
+        if math.isnan(middle):
+            return self.value
+        return self._output(middle)
+
+    def warm_start(self, prices):
+        self.value = (NAN, NAN, NAN)
+        middle = self.middle.warm_start(prices)
+        if math.isnan(middle):
+            return self.value
+        return self._output(middle)
+
+
+class StreamingIndicators:
+    """
+    The indicators of calculate_indicators, maintained bar by bar.
+
+    Every update costs time and memory independent of the history length:
+    O(1) for RSI, SMAs and MACD and O(period) for the Bollinger Bands'
+    windowed variance. The recurrences are TA-Lib's own, so values track
+    talib's batch output to within rounding (SMAs and MACD exactly).
+    Defaults are calculate_indicators' parameters. warm_start primes the
+    state from a historical array with vectorized passes instead of
+    replaying it bar by bar.
+
+    Args:
+    rsi_period (int): RSI period
+    sma_periods (tuple): Periods of the SMA_<period> outputs
+    macd_periods (tuple): (fast, slow, signal) MACD periods
+    bbands_period (int): Bollinger Bands period
+    bbands_nbdev (float): Bollinger Bands width in standard deviations
+    """
+
+    def __init__(self, rsi_period=RSI_PERIOD, sma_periods=SMA_PERIODS, macd_periods=MACD_PERIODS,
+                 bbands_period=BBANDS_PERIOD, bbands_nbdev=BBANDS_NBDEV):
+        self.rsi = StreamingRSI(rsi_period)
+        self.smas = {f'SMA_{period}': StreamingSMA(period) for period in sma_periods}
+        self.macd = StreamingMACD(*macd_periods)
+        self.bbands = StreamingBBands(bbands_period, bbands_nbdev)
+
+    def _values(self):
+        values = {'RSI': self.rsi.value}
+        values.update({name: sma.value for name, sma in self.smas.items()})
+        values['MACD'], values['MACD_Signal'], values['MACD_Hist'] = self.macd.value
+        values['Upper'], values['Middle'], values['Lower'] = self.bbands.value
+        return values
+
+    def update(self, bar):
+        """
+        Adds one bar.
+
+        Args:
+        bar (float or mapping): Price, or a mapping with a 'Price' entry
+
+        Returns:
+        dict: Latest value of each indicator, keyed like calculate_indicators' columns
+        """
+        price = float(bar if isinstance(bar, numbers.Real) else bar['Price'])
+        self.rsi.update(price)
+        for sma in self.smas.values():
+            sma.update(price)
+        self.macd.update(price)
+        self.bbands.update(price)
+        return self._values()
+
+    def warm_start(self, prices):
+        """
+        Resets the state to the end of a price history.
+
+        Returns:
+        dict: Indicator values at the last price
+        """
+        prices = np.asarray(prices, dtype=float)
+        self.rsi.warm_start(prices)
+        for sma in self.smas.values():
+            sma.warm_start(prices)
+        self.macd.warm_start(prices)
+        self.bbands.warm_start(prices)
+        return self._values()
@@ -0,0 +1,151 @@
+import datetime
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import QuantLib as ql
+
+from schedule_cache import schedule_cache
+
+BASIS_POINT = 1.0e-4
+
+# Per-process market used by pool workers, built once by the market factory
+_worker_book = None
+
+
+def _to_ql_date(value):
+    if isinstance(value, ql.Date):
+        return value
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    return ql.Date(value.day, value.month, value.year)
+
+
+class SwapBook:
+    """
+    Values books of vanilla swaps that share one floating index and discount curve.
+
+    Uses the conventions of irs_pricing.py: forward-generated TARGET schedules
+    with ModifiedFollowing, Actual/365 (Fixed) on both legs. Every leg is
+    linear in notional, fixed rate and spread, so the book only needs one
+    QuantLib swap per distinct (start, maturity, fixed tenor, floating tenor)
+    combination. Template swaps are cached on the book, schedules are interned
+    in the shared schedule_cache and every trade's figures are scaled from its
+    template with NumPy. Templates are not refreshed when market data moves,
+    so build a new book for a new market.
+
+    Args:
+    market_factory (callable): Returns (index, discount_curve) where index is an
+        ql.IborIndex (with any fixings already added) and discount_curve a
+        ql.YieldTermStructureHandle. It should set the evaluation date. It must
+        be a picklable module-level function to use max_workers.
+    """
+
+    def __init__(self, market_factory):
+        self.market_factory = market_factory
+        self.calendar = ql.TARGET()
+        self.day_count = ql.Actual365Fixed()
+        self.index, self.discount_curve = market_factory()
+        self.engine = ql.DiscountingSwapEngine(self.discount_curve)
+        self._templates = {}
+
+    def schedule(self, start, maturity, tenor_months):
+        return schedule_cache.schedule(start, maturity, ql.Period(tenor_months, ql.Months), self.calendar,
+                                       ql.ModifiedFollowing, ql.ModifiedFollowing, ql.DateGeneration.Forward, False)
+
+    def template(self, key):
+        """
+        Unit-notional figures for one schedule combination.
+
+        Returns:
+        tuple: (fixed annuity, floating leg NPV, floating annuity) per unit notional,
+            annuities being leg BPS per unit of rate
+        """
+        figures = self._templates.get(key)
+        if figures is None:
+            start, maturity, fixed_months, float_months = key
+            start, maturity = ql.Date(start), ql.Date(maturity)
+            swap = ql.VanillaSwap(ql.VanillaSwap.Payer, 1.0,
+                                  self.schedule(start, maturity, fixed_months), 0.0, self.day_count,
+                                  self.schedule(start, maturity, float_months), self.index, 0.0, self.day_count)
+            swap.setPricingEngine(self.engine)
+            # Payer: fixed leg is paid (negative), floating leg received (positive)
+            figures = (-swap.fixedLegBPS() / BASIS_POINT,
+                       swap.floatingLegNPV(),
+                       swap.floatingLegBPS() / BASIS_POINT)
+            self._templates[key] = figures
+        return figures
+
+    def price(self, trades, max_workers=1):
+        """
+        Values every trade in the book.
+
+        Args:
+        trades (pd.DataFrame or dict): Columns 'notional', 'fixed_rate',
+            'fixed_tenor' and 'float_tenor' (in months), 'maturity' (date-like)
+            and 'side' ('payer' or 'receiver'); optional 'start' (date-like,
+            evaluation date by default) and 'spread' (floating spread, 0 by default)
+        max_workers (int): Processes to shard distinct schedules across; None
+            uses os.cpu_count()
+
+        Returns:
+        dict: NumPy arrays 'npv', 'fair_rate', 'fair_spread', 'fixed_leg_bps',
+            'floating_leg_bps', 'fixed_leg_npv' and 'floating_leg_npv'
+        """
+        n_trades = len(trades['notional'])
+        today = ql.Settings.instance().evaluationDate
+        starts = trades['start'] if 'start' in trades else [today] * n_trades
+        keys = [(_to_ql_date(s).serialNumber(), _to_ql_date(m).serialNumber(), int(f), int(v))
+                for s, m, f, v in zip(starts, trades['maturity'], trades['fixed_tenor'], trades['float_tenor'])]
+
+        distinct = list(dict.fromkeys(keys))
+        missing = [key for key in distinct if key not in self._templates]
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers > 1 and len(missing) > 1:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(self.market_factory,)) as pool:
+                chunksize = max(1, len(missing) // (4 * max_workers))
+                self._templates.update(zip(missing, pool.map(_template_task, missing, chunksize=chunksize)))
+
+        figures = np.array([self.template(key) for key in distinct]).reshape(-1, 3)
+        row_of = {key: i for i, key in enumerate(distinct)}
+        rows = np.array([row_of[key] for key in keys], dtype=np.int64)
+        fixed_annuity, float_npv, float_annuity = figures[rows].T
+
+        notional = np.asarray(trades['notional'], dtype=float)
+        fixed_rate = np.asarray(trades['fixed_rate'], dtype=float)
+        spread = np.asarray(trades['spread'], dtype=float) if 'spread' in trades else np.zeros(n_trades)
+        sign = np.array([_side_sign(side) for side in trades['side']], dtype=float)
+
+        # Payer pays fixed and receives floating; receiver is the mirror image
+        fixed_leg_npv = -sign * notional * fixed_rate * fixed_annuity
+        floating_leg_npv = sign * notional * (float_npv + spread * float_annuity)
+        npv = fixed_leg_npv + floating_leg_npv
+        fixed_leg_bps = -sign * notional * fixed_annuity * BASIS_POINT
+        floating_leg_bps = sign * notional * float_annuity * BASIS_POINT
+        return {
+            'npv': npv,
+            'fair_rate': (float_npv + spread * float_annuity) / fixed_annuity,
+            'fair_spread': spread - npv / (floating_leg_bps / BASIS_POINT),
+            'fixed_leg_bps': fixed_leg_bps,
+            'floating_leg_bps': floating_leg_bps,
+            'fixed_leg_npv': fixed_leg_npv,
+            'floating_leg_npv': floating_leg_npv,
+        }
+
+
+def _side_sign(side):
+    if side in (ql.VanillaSwap.Payer, 'payer', 'Payer'):
+        return 1.0
+    if side in (ql.VanillaSwap.Receiver, 'receiver', 'Receiver'):
+        return -1.0
+    raise ValueError(f"unknown swap side: {side!r}")
+
+
+def _init_worker(market_factory):
+    global _worker_book
+    _worker_book = SwapBook(market_factory)
+
+
+def _template_task(key):
+    return _worker_book.template(key)
@@ -1,44 +1,207 @@
+import glob
+import os
+import tempfile
+
 import numpy as np
 import pandas as pd
 import talib
-import matplotlib.pyplot as plt
 from datetime import datetime, timedelta
 
+from plot_downsample import fill_band, new_figure, plot_line, plot_markers
+
 # Generate synthetic bond price data
 def generate_bond_data(start_date, end_date, initial_price=100):
     date_range = pd.date_range(start=start_date, end=end_date, freq='D')
     prices = initial_price + np.cumsum(np.random.normal(0, 0.1, len(date_range)))
     return pd.DataFrame({'Date': date_range, 'Price': prices}).set_index('Date')
 
+# Stream synthetic bond price data in fixed-size chunks
+def iter_bond_data(start_date, end_date=None, freq='D', initial_price=100, chunk_size=100_000, seed=None,
+                   dtype=np.float64, volatility=0.1):
+    """
+    Yields the random walk of generate_bond_data chunk by chunk.
+
+    The walk and the calendar carry over between chunks, and the draws come
+    from one np.random.default_rng stream, so a seed reproduces the same
+    series whatever the chunk size. Prices accumulate in float64 and are
+    only cast to dtype on output.
+
+    Args:
+    start_date: First timestamp
+    end_date: Last timestamp (inclusive), or None to stream forever
+    freq (str): pandas frequency of the bars, e.g. 'D' or '1min'
+    initial_price (float): Level the walk starts from
+    chunk_size (int): Bars per chunk
+    seed (int): Seed for np.random.default_rng
+    dtype: Price dtype, e.g. np.float32 to halve memory
+    volatility (float): Standard deviation of each step
+
+    Yields:
+    pd.DataFrame: 'Price' column indexed by 'Date'
+    """
+    rng = np.random.default_rng(seed)
+    offset = pd.tseries.frequencies.to_offset(freq)
+    end = pd.Timestamp(end_date) if end_date is not None else None
+    current = pd.Timestamp(start_date)
+    level = float(initial_price)
+    while end is None or current <= end:
+        dates = pd.date_range(start=current, periods=chunk_size, freq=offset, name='Date')
+        if end is not None:
+            dates = dates[dates <= end]
+        # Accumulate from the carried level so chunk boundaries do not change the rounding
+        steps = rng.normal(0, volatility, len(dates))
+        steps[0] += level
+        prices = np.cumsum(steps)
+        level = prices[-1]
+        current = dates[-1] + offset
+        yield pd.DataFrame({'Price': prices.astype(dtype, copy=False)}, index=dates)
+
+# Write streamed chunks to disk as memory-mappable .npy files
+def save_bond_data_chunks(chunks, directory):
+    """
+    Writes each chunk as 'chunk_NNNNNN.npy', a structured array of (Date, Price).
+
+    Chunks are written as they arrive, so the dataset never has to fit in memory.
+
+    Returns:
+    int: Number of bars written
+    """
+    os.makedirs(directory, exist_ok=True)
+    total = 0
+    for i, chunk in enumerate(chunks):
+        records = np.empty(len(chunk), dtype=[('Date', 'datetime64[ns]'), ('Price', chunk['Price'].dtype)])
+        records['Date'] = chunk.index.to_numpy(dtype='datetime64[ns]')
+        records['Price'] = chunk['Price'].to_numpy()
+        np.save(os.path.join(directory, f'chunk_{i:06d}.npy'), records)
+        total += len(records)
+    return total
+
+# Read chunks written by save_bond_data_chunks back one at a time
+def load_bond_data_chunks(directory, mmap=True):
+    """
+    Yields the saved chunks in order.
+
+    With mmap the files are memory-mapped and only the pages a chunk
+    touches are read. Each chunk is a separate frame, so pass them through
+    indicator_chunks to compute indicators without restarting the warm-up
+    at every chunk.
+
+    Yields:
+    pd.DataFrame: 'Price' column indexed by 'Date'
+    """
+    for path in sorted(glob.glob(os.path.join(directory, 'chunk_*.npy'))):
+        records = np.load(path, mmap_mode='r' if mmap else None)
+        yield pd.DataFrame({'Price': records['Price']}, index=pd.DatetimeIndex(records['Date'], name='Date'))
+
+# Indicator parameters of calculate_indicators, shared with the modules reproducing or caching it
+RSI_PERIOD = 14
+SMA_PERIODS = (20, 50)
+MACD_PERIODS = (12, 26, 9)
+BBANDS_PERIOD = 20
+BBANDS_NBDEV = 2.0
+
 # Calculate TA-Lib indicators
 def calculate_indicators(df):
-    df['RSI'] = talib.RSI(df['Price'])
-    df['SMA_20'] = talib.SMA(df['Price'], timeperiod=20)
-    df['SMA_50'] = talib.SMA(df['Price'], timeperiod=50)
-    df['MACD'], df['MACD_Signal'], df['MACD_Hist'] = talib.MACD(df['Price'])
-    df['Upper'], df['Middle'], df['Lower'] = talib.BBANDS(df['Price'], timeperiod=20)
+    df['RSI'] = talib.RSI(df['Price'], timeperiod=RSI_PERIOD)
+    for period in SMA_PERIODS:
+        df[f'SMA_{period}'] = talib.SMA(df['Price'], timeperiod=period)
+    fast, slow, signal = MACD_PERIODS
+    df['MACD'], df['MACD_Signal'], df['MACD_Hist'] = talib.MACD(df['Price'], fastperiod=fast, slowperiod=slow,
+                                                                signalperiod=signal)
+    df['Upper'], df['Middle'], df['Lower'] = talib.BBANDS(df['Price'], timeperiod=BBANDS_PERIOD,
+                                                          nbdevup=BBANDS_NBDEV, nbdevdn=BBANDS_NBDEV)
     return df
 
+# Signal rules in ascending priority: when several fire on the same bar the later
+# one wins, as with successive df.loc assignments. Each rule's buy/sell code
+# (+1/-1) is weighted by 3**priority, so the sign of the weighted sum is the
+# code of the highest-priority rule that fired.
+SIGNAL_RULES = ('rsi', 'ma_crossover', 'macd_crossover', 'bollinger')
+RSI_OVERSOLD = 30
+RSI_OVERBOUGHT = 70
+# Bump whenever signal_array's rule logic changes, so cached signals are recomputed
+SIGNAL_RULES_VERSION = 1
+SIGNAL_BLOCK = 1 << 16  # values per block, small enough for temporaries to stay in cache
+
+
+def _code(buy, sell):
+    return buy.view(np.int8) - sell.view(np.int8)
+
+
+def _crossing_code(fast, slow):
+    # fast - slow keeps the sign of the comparison for finite floats and stays NaN otherwise
+    spread = fast - slow
+    return _code((spread[1:] > 0) & (spread[:-1] <= 0), (spread[1:] < 0) & (spread[:-1] >= 0))
+
+
+def signal_array(price, rsi, sma_20, sma_50, macd, macd_signal, upper, lower):
+    """
+    Computes trading signals from raw indicator arrays.
+
+    All rules are evaluated block by block on int8 codes instead of writing
+    the signal column once per rule; the result matches generate_signals.
+    Arrays may also be 2-D (time x series) to signal many series at once.
+
+    Returns:
+    np.ndarray: int8 signal per bar (1: Buy, -1: Sell, 0: Hold), shaped like price
+    """
+    price, rsi, sma_20, sma_50, macd, macd_signal, upper, lower = (
+        np.asarray(a, dtype=float) for a in (price, rsi, sma_20, sma_50, macd, macd_signal, upper, lower))
+    n = len(price)
+    signal = np.empty(price.shape, dtype=np.int8)
+    block = max(1, SIGNAL_BLOCK // max(1, price[:1].size))
+    for lo in range(0, n, block):
+        hi = min(n, lo + block)
+        # Crossovers compare each bar with the one before, which the first bar lacks
+        prev = max(lo - 1, 0)
+        codes = {
+            'rsi': _code(rsi[lo:hi] < RSI_OVERSOLD, rsi[lo:hi] > RSI_OVERBOUGHT),
+            'ma_crossover': _crossing_code(sma_20[prev:hi], sma_50[prev:hi]),
+            'macd_crossover': _crossing_code(macd[prev:hi], macd_signal[prev:hi]),
+            'bollinger': _code(price[lo:hi] < lower[lo:hi], price[lo:hi] > upper[lo:hi]),
+        }
+        total = np.zeros((hi - lo,) + price.shape[1:], dtype=np.int8)
+        for priority, rule in enumerate(SIGNAL_RULES):
+            code = codes[rule]
+            total[len(total) - len(code):] += np.int8(3 ** priority) * code
+        np.sign(total, out=signal[lo:hi])
+    return signal
+
+
+# Bars of history prepended to each chunk by indicator_chunks. SMA and Bollinger
+# windows need 50; the EMA seeds of MACD and RSI decay at least as fast as
+# (13/14)**n, which is below float rounding after 512 bars.
+INDICATOR_LOOKBACK = 512
+
+# Run calculate_indicators chunk by chunk as if on the whole series
+def indicator_chunks(chunks, lookback=INDICATOR_LOOKBACK):
+    """
+    Yields calculate_indicators of each chunk, carrying warm-up over from the chunks before.
+
+    Each chunk is computed with the previous lookback bars prepended, which
+    are then dropped again, so indicators do not restart at every chunk
+    boundary and agree with an unchunked run to within rounding. For one
+    bar at a time, use streaming_indicators.StreamingIndicators instead.
+
+    Args:
+    chunks (iterable): Frames with a 'Price' column, e.g. from load_bond_data_chunks or iter_bond_data
+    lookback (int): Bars of history carried into each chunk
+
+    Yields:
+    pd.DataFrame: The chunk with its indicator columns
+    """
+    tail = None
+    for chunk in chunks:
+        frame = pd.concat([tail, chunk]) if tail is not None else chunk.copy()
+        frame = calculate_indicators(frame)
+        yield frame.iloc[len(frame) - len(chunk):]
+        tail = frame[['Price']].iloc[-lookback:] if lookback > 0 else None
+
 # Generate trading signals
 def generate_signals(df):
-    df['Signal'] = 0  # 0: Hold, 1: Buy, -1: Sell
-    
-    # RSI signals
-    df.loc[df['RSI'] < 30, 'Signal'] = 1
-    df.loc[df['RSI'] > 70, 'Signal'] = -1
-    
-    # Moving Average Crossover
-    df.loc[(df['SMA_20'] > df['SMA_50']) & (df['SMA_20'].shift(1) <= df['SMA_50'].shift(1)), 'Signal'] = 1
-    df.loc[(df['SMA_20'] < df['SMA_50']) & (df['SMA_20'].shift(1) >= df['SMA_50'].shift(1)), 'Signal'] = -1
-    
-    # MACD signals
-    df.loc[(df['MACD'] > df['MACD_Signal']) & (df['MACD'].shift(1) <= df['MACD_Signal'].shift(1)), 'Signal'] = 1
-    df.loc[(df['MACD'] < df['MACD_Signal']) & (df['MACD'].shift(1) >= df['MACD_Signal'].shift(1)), 'Signal'] = -1
-    
-    # Bollinger Bands signals
-    df.loc[df['Price'] < df['Lower'], 'Signal'] = 1
-    df.loc[df['Price'] > df['Upper'], 'Signal'] = -1
-    
+    df['Signal'] = signal_array(df['Price'].to_numpy(), df['RSI'].to_numpy(), df['SMA_20'].to_numpy(),
+                                df['SMA_50'].to_numpy(), df['MACD'].to_numpy(), df['MACD_Signal'].to_numpy(),
+                                df['Upper'].to_numpy(), df['Lower'].to_numpy())  # 0: Hold, 1: Buy, -1: Sell
     return df
 
 # Backtest strategy
@@ -54,46 +217,65 @@ def backtest_strategy(df):
     return cumulative_returns, total_return, sharpe_ratio
 
 # Visualize results
-def plot_results(df, cumulative_returns):
-    fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 16))
+def plot_results(df, cumulative_returns, output=None, max_points=None, method='minmax'):
+    """
+    Plots prices, indicators, signals and returns.
+
+    Lines are downsampled to the pixel width of their axes (or max_points)
+    so multi-million-bar series render quickly; buy and sell markers are
+    thinned only where they would overlap on the same pixel. With output the figure is written there (e.g. a PNG)
+    without pyplot or an interactive backend, otherwise it is shown.
+
+    Args:
+    method (str): 'minmax' or 'lttb', see plot_downsample.downsample_indices
+    """
+    fig = new_figure(headless=output is not None, figsize=(12, 16))
+    ax1, ax2, ax3 = fig.subplots(3, 1)
+    line = dict(max_points=max_points, method=method)
     
     # Plot 1: Price and Moving Averages
-    ax1.plot(df.index, df['Price'], label='Bond Price')
-    ax1.plot(df.index, df['SMA_20'], label='SMA 20')
-    ax1.plot(df.index, df['SMA_50'], label='SMA 50')
-    ax1.fill_between(df.index, df['Upper'], df['Lower'], alpha=0.2, label='Bollinger Bands')
-    ax1.scatter(df.index[df['Signal'] == 1], df['Price'][df['Signal'] == 1], marker='^', color='g', label='Buy Signal')
-    ax1.scatter(df.index[df['Signal'] == -1], df['Price'][df['Signal'] == -1], marker='v', color='r', label='Sell Signal')
+    plot_line(ax1, df.index, df['Price'], label='Bond Price', **line)
+    plot_line(ax1, df.index, df['SMA_20'], label='SMA 20', **line)
+    plot_line(ax1, df.index, df['SMA_50'], label='SMA 50', **line)
+    fill_band(ax1, df.index, df['Upper'], df['Lower'], alpha=0.2, label='Bollinger Bands', **line)
+    plot_markers(ax1, df.index[df['Signal'] == 1], df['Price'][df['Signal'] == 1], marker='^', color='g', label='Buy Signal')
+    plot_markers(ax1, df.index[df['Signal'] == -1], df['Price'][df['Signal'] == -1], marker='v', color='r', label='Sell Signal')
     ax1.set_title('Bond Price with Signals')
     ax1.legend()
     
     # Plot 2: RSI
-    ax2.plot(df.index, df['RSI'], label='RSI')
-    ax2.axhline(y=30, color='g', linestyle='--')
-    ax2.axhline(y=70, color='r', linestyle='--')
+    plot_line(ax2, df.index, df['RSI'], label='RSI', **line)
+    ax2.axhline(y=RSI_OVERSOLD, color='g', linestyle='--')
+    ax2.axhline(y=RSI_OVERBOUGHT, color='r', linestyle='--')
     ax2.set_title('Relative Strength Index (RSI)')
     ax2.legend()
     
     # Plot 3: Cumulative Returns
-    ax3.plot(cumulative_returns.index, cumulative_returns, label='Strategy Returns')
+    plot_line(ax3, cumulative_returns.index, cumulative_returns, label='Strategy Returns', **line)
     ax3.set_title('Cumulative Returns of Trading Strategy')
     ax3.legend()
     
-    plt.tight_layout()
-    plt.show()
+    fig.tight_layout()
+    if output is not None:
+        fig.savefig(output)
+    else:
+        import matplotlib.pyplot as plt
+        plt.show()
 
 # Main function
-def main():
-    # Generate synthetic bond data
+def main(seed=0, cache_dir=os.path.join(tempfile.gettempdir(), 'talib_bond_price_cache')):
+    # Imported here: indicator_cache imports this module
+    from indicator_cache import IndicatorCache
+
+    # Generate synthetic bond data, seeded so reruns see the same series
     start_date = datetime(2020, 1, 1)
     end_date = datetime(2023, 1, 1)
-    df = generate_bond_data(start_date, end_date)
-    
-    # Calculate indicators
-    df = calculate_indicators(df)
+    df = pd.concat(iter_bond_data(start_date, end_date, seed=seed))
     
-    # Generate signals
-    df = generate_signals(df)
+    # Calculate indicators and generate signals, reusing earlier runs' results for unchanged inputs
+    cache = IndicatorCache(cache_dir)
+    df = cache.calculate_indicators(df)
+    df = cache.generate_signals(df)
     
     # Backtest strategy
     cumulative_returns, total_return, sharpe_ratio = backtest_strategy(df)
@@ -101,6 +283,8 @@ def main():
     # Print results
     print(f"Total Return: {total_return:.2%}")
     print(f"Sharpe Ratio: {sharpe_ratio:.2f}")
+    stats = cache.stats()
+    print(f"Indicator cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries")
     
     # Visualize results
     plot_results(df, cumulative_returns)
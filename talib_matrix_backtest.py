@@ -0,0 +1,145 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+
+from talib_bond_price_analyze import (BBANDS_NBDEV, BBANDS_PERIOD, MACD_PERIODS, RSI_PERIOD, SMA_PERIODS,
+                                      signal_array)
+
+WINDOW_BLOCK = 1 << 20  # window values per block, bounds the temporaries of the windowed passes
+
+
+def _window_blocks(values, period):
+    # Yields (first output row, windows) blocks of the sliding windows along time, as views
+    windows = sliding_window_view(values, period, axis=0)
+    step = max(1, WINDOW_BLOCK // (period * max(1, values[:1].size)))
+    for lo in range(0, len(windows), step):
+        yield period - 1 + lo, windows[lo:lo + step]
+
+
+def _rolling_mean(values, period):
+    # Each window is summed on its own, so the rounding error does not grow with the history
+    out = np.full(values.shape, np.nan)
+    if len(values) < period:
+        return out
+    for row, windows in _window_blocks(values, period):
+        out[row:row + len(windows)] = windows.mean(axis=-1)
+    return out
+
+
+def _ema(values, period, seed_end, alpha=None):
+    # TA-Lib's EMA: seeded with the mean of the period values ending at seed_end
+    alpha = 2.0 / (period + 1) if alpha is None else alpha
+    out = np.full(values.shape, np.nan)
+    if seed_end >= len(values):
+        return out
+    seed = values[seed_end - period + 1:seed_end + 1].mean(axis=0)
+    out[seed_end] = seed
+    if seed_end + 1 < len(values):
+        out[seed_end + 1:], _ = lfilter([alpha], [1.0, alpha - 1.0], values[seed_end + 1:], axis=0,
+                                        zi=((1.0 - alpha) * seed)[None, ...])
+    return out
+
+
+def matrix_rsi(prices, period=RSI_PERIOD):
+    """
+    TA-Lib RSI (Wilder smoothing) of every column of a time x series array.
+    """
+    moves = np.diff(prices, axis=0, prepend=prices[:1])
+    gains = _ema(np.maximum(moves, 0.0), period, period, alpha=1.0 / period)
+    losses = _ema(np.maximum(-moves, 0.0), period, period, alpha=1.0 / period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        total = gains + losses
+        return np.where(total != 0, 100.0 * gains / total, np.where(np.isnan(total), np.nan, 0.0))
+
+
+def matrix_macd(prices, fast=MACD_PERIODS[0], slow=MACD_PERIODS[1], signal=MACD_PERIODS[2]):
+    """
+    TA-Lib MACD of every column of a time x series array.
+
+    As in TA-Lib both EMAs are seeded on the bar where the slow one can start.
+
+    Returns:
+    tuple: (macd, signal, histogram) arrays
+    """
+    start = slow - 1
+    line = _ema(prices, fast, start) - _ema(prices, slow, start)
+    signal_line = _ema(np.nan_to_num(line), signal, start + signal - 1)
+    # TA-Lib only reports the MACD line once its signal line exists
+    line[:start + signal - 1] = np.nan
+    return line, signal_line, line - signal_line
+
+
+def matrix_bbands(prices, period=BBANDS_PERIOD, nbdev=BBANDS_NBDEV):
+    """
+    TA-Lib Bollinger Bands (SMA, population std dev) of every column of a time x series array.
+
+    Returns:
+    tuple: (upper, middle, lower) arrays
+    """
+    middle = _rolling_mean(prices, period)
+    # Two-pass variance around each window's mean, as TA-Lib and StreamingBBands take it
+    std_dev = np.full(prices.shape, np.nan)
+    if len(prices) >= period:
+        for row, windows in _window_blocks(prices, period):
+            deviations = windows - middle[row:row + len(windows), ..., None]
+            std_dev[row:row + len(windows)] = np.sqrt((deviations * deviations).mean(axis=-1))
+    return middle + nbdev * std_dev, middle, middle - nbdev * std_dev
+
+
+def matrix_indicators(prices):
+    """
+    The indicators of calculate_indicators for every column of a time x series array.
+
+    Returns:
+    dict: Arrays keyed by the column names calculate_indicators uses
+    """
+    prices = np.asarray(prices, dtype=float)
+    indicators = {'Price': prices, 'RSI': matrix_rsi(prices)}
+    for period in SMA_PERIODS:
+        indicators[f'SMA_{period}'] = _rolling_mean(prices, period)
+    indicators['MACD'], indicators['MACD_Signal'], indicators['MACD_Hist'] = matrix_macd(prices)
+    indicators['Upper'], indicators['Middle'], indicators['Lower'] = matrix_bbands(prices)
+    return indicators
+
+
+def backtest_matrix(prices, periods_per_year=252):
+    """
+    Runs the talib_bond_price_analyze strategy on every column of a time x series array at once.
+
+    Indicators, signals, positions and returns are computed column-wise
+    with the same rules as calculate_indicators, generate_signals and
+    backtest_strategy; time is the only axis anything iterates over, inside
+    NumPy and SciPy.
+
+    Args:
+    prices (array-like): Prices, one row per bar and one column per series
+    periods_per_year (int): Annualizes the Sharpe ratio
+
+    Returns:
+    dict: Per-series arrays 'total_return', 'sharpe_ratio' and 'max_drawdown'
+        (largest peak-to-trough fall of cumulative returns, as a positive fraction),
+        plus the int8 'signals' matrix
+    """
+    prices = np.asarray(prices, dtype=float)
+    if prices.ndim == 1:
+        prices = prices[:, None]
+    ind = matrix_indicators(prices)
+    signals = signal_array(prices, ind['RSI'], ind['SMA_20'], ind['SMA_50'], ind['MACD'], ind['MACD_Signal'],
+                           ind['Upper'], ind['Lower'])
+
+    # Yesterday's signal is today's position; the first bar has no return
+    strategy_returns = signals[:-1] * (prices[1:] / prices[:-1] - 1.0)
+    growth = np.cumprod(1.0 + strategy_returns, axis=0)
+    if len(growth) == 0:
+        nan = np.full(prices.shape[1], np.nan)
+        return {'total_return': nan, 'sharpe_ratio': nan, 'max_drawdown': nan.copy(), 'signals': signals}
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe_ratio = (np.sqrt(periods_per_year) * strategy_returns.mean(axis=0)
+                        / strategy_returns.std(axis=0, ddof=1))
+    drawdown = 1.0 - growth / np.maximum.accumulate(growth, axis=0)
+    return {
+        'total_return': growth[-1] - 1.0,
+        'sharpe_ratio': sharpe_ratio,
+        'max_drawdown': drawdown.max(axis=0),
+        'signals': signals,
+    }
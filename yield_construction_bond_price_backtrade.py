@@ -2,29 +2,42 @@ import backtrader as bt
 import QuantLib as ql
 import datetime
 
+from schedule_cache import schedule_cache
+
 class YieldCurveBondStrategy(bt.Strategy):
     params = (
         ('bond_maturity', 5),  # years
         ('coupon_rate', 0.04),  # 4%
         ('face_value', 100),
+        # Build the curve and bond once and only update a rate quote per bar.
+        # The bond is then issued on the first bar and ages like a held
+        # position instead of being re-issued with a fresh 5y maturity each
+        # bar; once it matures it is re-issued, so trading carries on against
+        # a live bond rather than one whose NPV has dropped to 0.
+        ('incremental', False),
     )
 
     def __init__(self):
         self.order = None
         self.yield_curve = None
         self.bond = None
+        self.rate_quote = None
 
     def next(self):
         # Update yield curve and price bond on each bar
-        self.update_yield_curve()
-        self.price_bond()
+        if self.p.incremental:
+            self.update_rate_quote()
+        else:
+            self.update_yield_curve()
+            self.price_bond()
+        bond_npv = self.bond.NPV()
 
         # Your trading logic here
         # For example, buy if bond price is below face value
-        if self.bond.NPV() < self.p.face_value and not self.position:
+        if bond_npv < self.p.face_value and not self.position:
             self.buy()
         # Sell if bond price is above face value and we have a position
-        elif self.bond.NPV() > self.p.face_value and self.position:
+        elif bond_npv > self.p.face_value and self.position:
             self.sell()
 
     def update_yield_curve(self):
@@ -33,9 +46,9 @@ class YieldCurveBondStrategy(bt.Strategy):
                         self.data.datetime.date(0).year)
         ql.Settings.instance().evaluationDate = today
 
-        # Use closing prices as "rates" for simplicity
-        spot_dates = [today + ql.Period(i, ql.Years) for i in range(1, 11)]
-        spot_rates = [self.data.close[0] / 100 for _ in range(10)]  # Convert to decimal
+        # Use closing prices as "rates" for simplicity; the first pillar anchors the curve at today
+        spot_dates = [today + ql.Period(i, ql.Years) for i in range(0, 11)]
+        spot_rates = [self.data.close[0] / 100 for _ in range(11)]  # Convert to decimal
 
         day_count = ql.Actual365Fixed()
         calendar = ql.UnitedStates()
@@ -46,6 +59,24 @@ class YieldCurveBondStrategy(bt.Strategy):
         self.yield_curve = ql.ZeroCurve(spot_dates, spot_rates, day_count, calendar, interpolation,
                                         compounding, compounding_frequency)
 
+    def update_rate_quote(self):
+        today = ql.Date(self.data.datetime.date(0).day,
+                        self.data.datetime.date(0).month,
+                        self.data.datetime.date(0).year)
+        ql.Settings.instance().evaluationDate = today
+
+        if self.rate_quote is None:
+            # update_yield_curve builds a flat zero curve, which is a flat forward
+            # curve with the same compounding; this one follows the evaluation date
+            self.rate_quote = ql.SimpleQuote(self.data.close[0] / 100)
+            self.yield_curve = ql.FlatForward(0, ql.NullCalendar(), ql.QuoteHandle(self.rate_quote),
+                                              ql.Actual365Fixed(), ql.Compounded, ql.Annual)
+            self.price_bond()
+        else:
+            self.rate_quote.setValue(self.data.close[0] / 100)
+            if self.bond.isExpired():
+                self.price_bond()
+
     def price_bond(self):
         if self.yield_curve is None:
             return
@@ -57,8 +88,8 @@ class YieldCurveBondStrategy(bt.Strategy):
         business_convention = ql.Unadjusted
         date_generation = ql.DateGeneration.Backward
         month_end = False
-        schedule = ql.Schedule(today, maturity_date, tenor, calendar, business_convention,
-                               business_convention, date_generation, month_end)
+        schedule = schedule_cache.schedule(today, maturity_date, tenor, calendar, business_convention,
+                                           business_convention, date_generation, month_end)
 
         coupons = [self.p.coupon_rate]
         day_count = ql.Actual365Fixed()
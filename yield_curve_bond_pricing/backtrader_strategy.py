@@ -1,16 +1,101 @@
 import backtrader as bt
+import numpy as np
 import talib
 
+
+def precompute_rsi(prices, period=14):
+    """
+    Computes the same RSI as bt.indicators.RSI_SMA over a whole price array at once.
+
+    Up and down moves are averaged with TA-Lib's SMA (Cutler's RSI), which
+    is what RSI_SMA does bar by bar; talib.RSI uses Wilder smoothing and
+    would not match.
+
+    Args:
+    prices (array-like): Price series
+    period (int): RSI lookback
+
+    Returns:
+    np.ndarray: RSI values, NaN during the warm-up period
+    """
+    prices = np.asarray(prices, dtype=float)
+    moves = np.diff(prices, prepend=np.nan)
+    up = talib.SMA(np.where(moves > 0, moves, 0.0), timeperiod=period)
+    down = talib.SMA(np.where(moves < 0, -moves, 0.0), timeperiod=period)
+    up[:period] = down[:period] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100.0 - 100.0 / (1.0 + up / down)
+
+
+class PrecomputedIndicatorData(bt.feeds.PandasData):
+    """
+    PandasData feed carrying indicator columns computed before cerebro.run().
+
+    Columns are pulled out of the frame as NumPy arrays once in start(), so
+    each bar is a handful of array lookups instead of one DataFrame.iloc
+    call per line.
+    """
+    lines = ('rsi',)
+    params = (
+        ('rsi', 'RSI'),
+    )
+
+    def start(self):
+        super().start()
+        frame = self.p.dataname
+        self._arrays = {}
+        for datafield in self.getlinealiases():
+            if datafield == 'datetime':
+                continue
+            colindex = self._colmapping[datafield]
+            if colindex is not None:
+                self._arrays[datafield] = frame.iloc[:, colindex].to_numpy(dtype=float)
+
+        coldtime = self._colmapping['datetime']
+        stamps = frame.index if coldtime is None else frame.iloc[:, coldtime]
+        self._datetimes = [bt.date2num(stamp.to_pydatetime()) for stamp in stamps]
+
+    def _load(self):
+        self._idx += 1
+        if self._idx >= len(self._datetimes):
+            return False
+
+        for datafield, values in self._arrays.items():
+            getattr(self.lines, datafield)[0] = values[self._idx]
+        self.lines.datetime[0] = self._datetimes[self._idx]
+        return True
+
+
+def add_precomputed_indicators(df, price_column='Price', rsi_period=14):
+    """
+    Adds the indicator columns read by PrecomputedIndicatorData to df.
+
+    Args:
+    df (pd.DataFrame): Price frame fed to Backtrader
+    price_column (str): Column holding the prices
+    rsi_period (int): RSI lookback, must match the strategy's rsi_period
+
+    Returns:
+    pd.DataFrame: df with an 'RSI' column
+    """
+    df['RSI'] = precompute_rsi(df[price_column].to_numpy(), period=rsi_period)
+    return df
+
+
 class BondTradingStrategy(bt.Strategy):
     params = (
         ('rsi_period', 14),
         ('rsi_overbought', 70),
         ('rsi_oversold', 30),
+        ('precomputed_rsi', False),  # read RSI from a PrecomputedIndicatorData line
     )
 
     def __init__(self):
         self.bond_price = self.datas[0].close
-        self.rsi = bt.indicators.RSI_SMA(self.bond_price, period=self.params.rsi_period)
+        if self.params.precomputed_rsi:
+            self.rsi = self.datas[0].rsi
+        else:
+            self.rsi = bt.indicators.RSI_SMA(self.bond_price, period=self.params.rsi_period)
 
     def next(self):
         if not self.position:
@@ -18,4 +103,4 @@ class BondTradingStrategy(bt.Strategy):
                 self.buy()
         else:
             if self.rsi > self.params.rsi_overbought:
-                self.sell()
\ No newline at end of file
+                self.sell()
@@ -0,0 +1,188 @@
+"""
+Headless benchmark suite for the yield curve / bond pricing pipeline.
+
+Each case runs in a fresh worker process so peak RSS is reported per case.
+
+Usage:
+python benchmark.py                              # run and print results
+python benchmark.py --case single_bond_pricing   # run selected cases only
+python benchmark.py --save bench_baseline.json   # store a baseline
+python benchmark.py --compare bench_baseline.json --threshold 0.2
+"""
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import QuantLib as ql
+
+from yield_curve import build_yield_curve
+from bond_pricing import price_bond, BondRepricingSession
+
+TODAY = ql.Date(15, 6, 2023)
+SPOT_DATES = [TODAY, TODAY + ql.Period(1, ql.Years), TODAY + ql.Period(5, ql.Years), TODAY + ql.Period(10, ql.Years)]
+SPOT_RATES = [0.02, 0.025, 0.03, 0.035]
+SWEEP_DAYS = 365
+
+
+def _curve():
+    return build_yield_curve(TODAY, SPOT_DATES, SPOT_RATES, cache=None)
+
+
+def _bonds(n):
+    return [(ql.Date(1, 1, 2020) + 7 * i, ql.Date(1, 1, 2030) - 5 * i, 0.02 + 0.0005 * i) for i in range(n)]
+
+
+def _setup_curve_construction():
+    return _curve
+
+
+def _setup_single_bond():
+    curve = _curve()
+    issue_date, maturity_date, coupon_rate = _bonds(1)[0]
+    return lambda: price_bond(curve, issue_date, maturity_date, coupon_rate)
+
+
+def _setup_daily_sweep(n_bonds):
+    def setup():
+        curve = _curve()
+        bonds = _bonds(n_bonds)
+        dates = [TODAY + ql.Period(i, ql.Days) for i in range(SWEEP_DAYS)]
+
+        def sweep():
+            for bond in bonds:
+                BondRepricingSession(curve, *bond).price_series(dates)
+        return sweep
+    return setup
+
+
+def _setup_backtrader_run():
+    from main import main
+    return lambda: main(plot=False)
+
+
+# name -> (setup returning the timed callable, default repetitions)
+CASES = {
+    'curve_construction': (_setup_curve_construction, 2000),
+    'single_bond_pricing': (_setup_single_bond, 2000),
+    'daily_sweep_1_bond': (_setup_daily_sweep(1), 50),
+    'daily_sweep_10_bonds': (_setup_daily_sweep(10), 10),
+    'daily_sweep_100_bonds': (_setup_daily_sweep(100), 3),
+    'backtrader_run': (_setup_backtrader_run, 3),
+}
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_case(name, repeat):
+    setup, _ = CASES[name]
+    fn = setup()
+    fn()  # warm-up
+
+    latencies = np.empty(repeat)
+    for i in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies[i] = time.perf_counter() - start
+
+    return {
+        'repeat': repeat,
+        'ops_per_sec': float(repeat / latencies.sum()),
+        'p50_ms': float(np.percentile(latencies, 50) * 1e3),
+        'p99_ms': float(np.percentile(latencies, 99) * 1e3),
+        'peak_rss_mb': _peak_rss_mb(),
+    }
+
+
+def run_benchmarks(names=None, scale=1.0):
+    """
+    Runs the selected cases, each in its own worker process.
+
+    Args:
+    names (list): Case names to run, all cases by default
+    scale (float): Multiplier on each case's default repetitions
+
+    Returns:
+    dict: case name -> result dict
+    """
+    results = {}
+    for name in names or CASES:
+        repeat = max(1, int(CASES[name][1] * scale))
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            results[name] = pool.submit(_run_case, name, repeat).result()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Lists cases that regressed past threshold against a baseline.
+
+    A case regresses when its throughput drops, or its p99 latency grows,
+    by more than the threshold fraction.
+
+    Returns:
+    list: Human-readable regression messages
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result['ops_per_sec'] < base['ops_per_sec'] * (1 - threshold):
+            regressions.append(f"{name}: ops/sec {result['ops_per_sec']:.1f} vs baseline {base['ops_per_sec']:.1f}")
+        if result['p99_ms'] > base['p99_ms'] * (1 + threshold):
+            regressions.append(f"{name}: p99 {result['p99_ms']:.3f}ms vs baseline {base['p99_ms']:.3f}ms")
+    return regressions
+
+
+def print_results(results):
+    print(f"{'case':<24}{'ops/sec':>12}{'p50 ms':>12}{'p99 ms':>12}{'peak RSS MB':>14}")
+    for name, r in results.items():
+        print(f"{name:<24}{r['ops_per_sec']:>12.1f}{r['p50_ms']:>12.3f}{r['p99_ms']:>12.3f}{r['peak_rss_mb']:>14.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--case', action='append', dest='cases', choices=list(CASES),
+                        help='case to run, may be repeated (default: all)')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiplier on repetitions per case')
+    parser.add_argument('--save', metavar='PATH', help='write results as a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='fail if results regress against this baseline')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed regression fraction (default: 0.2)')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.cases, scale=args.scale)
+    print_results(results)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'quantlib': ql.__version__,
+                'machine': platform.machine(),
+                'results': results,
+            }, f, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}")
+        if regressions:
+            return 1
+        print("No regressions")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
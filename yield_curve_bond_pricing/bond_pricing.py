@@ -1,26 +1,261 @@
+import functools
+
+import numpy as np
 import QuantLib as ql
 
+SETTLEMENT_DAYS = 2
+
+
+@functools.lru_cache(maxsize=1024)
+def _interned_schedule(issue_serial, maturity_serial):
+    return ql.Schedule(ql.Date(issue_serial), ql.Date(maturity_serial), ql.Period(ql.Semiannual),
+                       ql.TARGET(), ql.ModifiedFollowing, ql.ModifiedFollowing,
+                       ql.DateGeneration.Backward, False)
+
+
+def bond_schedule(issue_date, maturity_date):
+    """
+    Builds the coupon schedule shared by price_bond and price_bond_portfolio.
+
+    Every other schedule argument is fixed, so schedules are interned by
+    issue and maturity date; bonds copy their schedule, so sharing is safe.
+    """
+    return _interned_schedule(issue_date.serialNumber(), maturity_date.serialNumber())
+
+
 def price_bond(yield_curve, issue_date, maturity_date, coupon_rate, face_value=100):
     """
     Prices a fixed-rate bond using QuantLib.
-    
+
     Args:
     yield_curve (ql.YieldTermStructureHandle): The yield curve
     issue_date (ql.Date): The bond's issue date
     maturity_date (ql.Date): The bond's maturity date
     coupon_rate (float): The bond's coupon rate (as a decimal)
     face_value (float): The bond's face value
-    
+
     Returns:
     float: The bond's price
     """
-    schedule = ql.Schedule(issue_date, maturity_date, ql.Period(ql.Semiannual),
-                           ql.TARGET(), ql.ModifiedFollowing, ql.ModifiedFollowing,
-                           ql.DateGeneration.Backward, False)
-    
-    bond = ql.FixedRateBond(2, face_value, schedule, [coupon_rate], ql.Actual360())
-    
+    schedule = bond_schedule(issue_date, maturity_date)
+
+    bond = ql.FixedRateBond(SETTLEMENT_DAYS, face_value, schedule, [coupon_rate], ql.Actual360())
+
     engine = ql.DiscountingBondEngine(yield_curve)
     bond.setPricingEngine(engine)
-    
-    return bond.cleanPrice()
\ No newline at end of file
+
+    return bond.cleanPrice()
+
+
+class BondRepricingSession:
+    """
+    Prices one fixed-rate bond repeatedly as the evaluation date moves.
+
+    The schedule, bond and engine are built once with the same conventions
+    as price_bond. The bond observes the global evaluation date, so each date
+    move only triggers QuantLib's lazy recalculation.
+
+    Args:
+    yield_curve (ql.YieldTermStructureHandle): The yield curve
+    issue_date (ql.Date): The bond's issue date
+    maturity_date (ql.Date): The bond's maturity date
+    coupon_rate (float): The bond's coupon rate (as a decimal)
+    face_value (float): The bond's face value
+    """
+
+    def __init__(self, yield_curve, issue_date, maturity_date, coupon_rate, face_value=100):
+        self.schedule = bond_schedule(issue_date, maturity_date)
+        self.bond = ql.FixedRateBond(SETTLEMENT_DAYS, face_value, self.schedule, [coupon_rate], ql.Actual360())
+        self.engine = ql.DiscountingBondEngine(yield_curve)
+        self.bond.setPricingEngine(self.engine)
+
+    def price(self):
+        """
+        Returns the clean price at the current evaluation date.
+        """
+        return self.bond.cleanPrice()
+
+    def price_series(self, dates):
+        """
+        Returns clean prices with the evaluation date set to each of dates.
+
+        The evaluation date in effect before the call is restored afterwards.
+
+        Args:
+        dates (list): ql.Date evaluation dates
+
+        Returns:
+        np.ndarray: Clean price for each date
+        """
+        settings = ql.Settings.instance()
+        original_date = settings.evaluationDate
+        prices = np.empty(len(dates))
+        try:
+            for i, date in enumerate(dates):
+                settings.evaluationDate = date
+                prices[i] = self.bond.cleanPrice()
+        finally:
+            settings.evaluationDate = original_date
+        return prices
+
+    def iter_prices(self, dates):
+        """
+        Lazily yields (date, clean price) pairs for each evaluation date.
+
+        Prices are computed only as they are consumed, so dates may be any
+        iterable, including an unbounded generator. The original evaluation
+        date is restored once the generator is exhausted or closed.
+
+        Args:
+        dates (iterable): ql.Date evaluation dates
+
+        Yields:
+        tuple: (ql.Date, float)
+        """
+        settings = ql.Settings.instance()
+        original_date = settings.evaluationDate
+        try:
+            for date in dates:
+                settings.evaluationDate = date
+                yield date, self.bond.cleanPrice()
+        finally:
+            settings.evaluationDate = original_date
+
+
+def price_bond_portfolio(yield_curve, issue_dates, maturity_dates, coupon_rates, face_values=100):
+    """
+    Prices a book of fixed-rate bonds against one curve in a single vectorized pass.
+
+    Uses the same conventions as price_bond (semiannual TARGET schedule,
+    Actual/360 coupons, T+2 settlement). Schedules for the whole book are
+    generated as one padded bond x date matrix and every cashflow is then
+    discounted at once, with the curve queried once per distinct date.
+
+    Args:
+    yield_curve (ql.YieldTermStructureHandle): The yield curve
+    issue_dates (list): ql.Date issue date for each bond
+    maturity_dates (list): ql.Date maturity date for each bond
+    coupon_rates (array-like): Coupon rate of each bond (as a decimal)
+    face_values (array-like or float): Face value of each bond
+
+    Returns:
+    tuple: (clean, dirty) price arrays quoted per 100 of face, as price_bond does
+    """
+    n_bonds = len(issue_dates)
+    if len(maturity_dates) != n_bonds:
+        raise ValueError("issue_dates and maturity_dates must have the same length")
+    coupon_rates = np.broadcast_to(np.asarray(coupon_rates, dtype=float), (n_bonds,))
+    face_values = np.broadcast_to(np.asarray(face_values, dtype=float), (n_bonds,))
+    issue = np.array([d.serialNumber() for d in issue_dates], dtype=np.int64)
+    maturity = np.array([d.serialNumber() for d in maturity_dates], dtype=np.int64)
+    if np.any(maturity <= issue):
+        raise ValueError("every maturity date must be after its issue date")
+
+    # Padded accrual boundaries, one row per bond
+    dates, n_dates = _schedule_matrix(issue_dates, maturity_dates, issue, maturity)
+    starts = dates[:, :-1]
+    ends = dates[:, 1:]
+    valid = np.arange(ends.shape[1])[None, :] < (n_dates - 1)[:, None]
+    last_payment = dates[np.arange(n_bonds), n_dates - 1]
+
+    # Cashflows paid on the settlement date are treated as already occurred
+    today = ql.Settings.instance().evaluationDate
+    settlement = ql.TARGET().advance(today, SETTLEMENT_DAYS, ql.Days).serialNumber()
+    alive = valid & (ends > settlement)
+
+    # Discount factors for each distinct date, relative to the settlement date
+    unique_dates = np.unique(np.concatenate([ends[alive], last_payment[last_payment > settlement], [settlement]]))
+    unique_dfs = np.array([yield_curve.discount(ql.Date(int(s))) for s in unique_dates])
+    settlement_df = unique_dfs[np.searchsorted(unique_dates, settlement)]
+
+    def discount(serials):
+        idx = np.minimum(np.searchsorted(unique_dates, serials), len(unique_dates) - 1)
+        return np.where(serials > settlement, unique_dfs[idx], 0.0) / settlement_df
+
+    coupons = face_values[:, None] * coupon_rates[:, None] * (ends - starts) / 360.0
+    settlement_value = (np.where(alive, coupons * discount(ends), 0.0).sum(axis=1)
+                        + np.where(last_payment > settlement, face_values * discount(last_payment), 0.0))
+
+    accruing = alive & (starts < settlement)
+    accrued_days = np.minimum(settlement, ends) - starts
+    accrued = np.where(accruing, face_values[:, None] * coupon_rates[:, None] * accrued_days / 360.0,
+                       0.0).sum(axis=1)
+
+    dirty = settlement_value * 100.0 / face_values
+    clean = dirty - accrued * 100.0 / face_values
+    return clean, dirty
+
+
+_EPOCH_SERIAL = 25569  # ql.Date(1, 1, 1970).serialNumber()
+
+
+def _month(serials):
+    return (serials - _EPOCH_SERIAL).astype('datetime64[D]').astype('datetime64[M]')
+
+
+def _add_months(serials, months):
+    """
+    Shifts serial dates by whole months, clamping to month end like ql.Period.
+    """
+    month_starts = _month(serials)
+    day_of_month = serials - _EPOCH_SERIAL - month_starts.astype('datetime64[D]').astype(np.int64)
+    shifted = month_starts + months
+    shifted_start = shifted.astype('datetime64[D]').astype(np.int64)
+    month_length = (shifted + 1).astype('datetime64[D]').astype(np.int64) - shifted_start
+    return shifted_start + np.minimum(day_of_month, month_length - 1) + _EPOCH_SERIAL
+
+
+def _modified_following(serials, calendar, first, last):
+    """
+    Adjusts serial dates with ModifiedFollowing using a business-day table for [first, last].
+    """
+    span = np.arange(first - 7, last + 8, dtype=np.int64)
+    business = np.array([calendar.isBusinessDay(ql.Date(int(s))) for s in span])
+    business_days = span[business]
+    offset = serials - span[0]
+    last_index = len(business_days) - 1
+    following = business_days[np.minimum(np.searchsorted(business_days, span), last_index)][offset]
+    preceding = business_days[np.maximum(np.searchsorted(business_days, span, side='right') - 1, 0)][offset]
+    return np.where(_month(following) == _month(serials), following, preceding)
+
+
+def _schedule_matrix(issue_dates, maturity_dates, issue, maturity):
+    """
+    Generates bond_schedule() dates for every bond at once.
+
+    Mirrors QuantLib's backward generation: unadjusted dates roll back from
+    maturity in six-month steps, the issue date closes the front stub and
+    every date is then adjusted ModifiedFollowing on TARGET. Rows whose
+    adjusted dates collapse onto each other fall back to ql.Schedule, which
+    knows how to drop the degenerate period.
+
+    Returns:
+    tuple: (dates, n_dates) where dates is a bond x date matrix of serial
+        numbers padded with the last date and n_dates the row lengths
+    """
+    n_bonds = len(issue)
+    steps = int(np.max((maturity - issue) // 181)) + 2
+    rolled = _add_months(np.repeat(maturity, steps), np.tile(-6 * np.arange(steps), n_bonds))
+    rolled = rolled.reshape(n_bonds, steps)
+    n_rolled = (rolled >= issue[:, None]).sum(axis=1)
+    stub = rolled[np.arange(n_bonds), n_rolled - 1] != issue
+    n_dates = n_rolled + stub
+
+    # Rolled dates are descending; read them back (plus the issue stub) in ascending order
+    width = int(n_dates.max())
+    position = n_dates[:, None] - 1 - np.arange(width)[None, :]
+    source = np.concatenate([rolled, issue[:, None]], axis=1)
+    source[np.arange(n_bonds), n_rolled] = issue
+    dates = np.take_along_axis(source, np.clip(position, 0, steps), axis=1)
+    dates = _modified_following(dates, ql.TARGET(), int(issue.min()), int(maturity.max()))
+
+    padded = position < 0
+    dates = np.where(padded, dates[np.arange(n_bonds), n_dates - 1][:, None], dates)
+    degenerate = np.any((np.diff(dates, axis=1) <= 0) & ~padded[:, 1:], axis=1)
+    for i in np.flatnonzero(degenerate):
+        row = np.array([d.serialNumber() for d in bond_schedule(issue_dates[i], maturity_dates[i])],
+                       dtype=np.int64)
+        n_dates[i] = len(row)
+        dates[i, :len(row)] = row
+        dates[i, len(row):] = row[-1]
+    return dates, n_dates
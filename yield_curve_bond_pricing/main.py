@@ -1,48 +1,48 @@
 import QuantLib as ql
 import backtrader as bt
 from datetime import datetime, timedelta
-import pandas as pd
 
 from yield_curve import build_yield_curve
-from bond_pricing import price_bond
-from backtrader_strategy import BondTradingStrategy
+from bond_pricing import BondRepricingSession
+from price_feed import StreamingPriceFeed
+from sweep import sweep_frame
+from backtrader_strategy import BondTradingStrategy, PrecomputedIndicatorData, add_precomputed_indicators
 
-def main():
+def main(streaming=True, plot=True):
     # Set up QuantLib dates and rates
     today = ql.Date(15, 6, 2023)
     spot_dates = [today, today + ql.Period(1, ql.Years), today + ql.Period(5, ql.Years), today + ql.Period(10, ql.Years)]
     spot_rates = [0.02, 0.025, 0.03, 0.035]
 
-    # Build yield curve
-    yield_curve = build_yield_curve(today, spot_dates, spot_rates)
-
     # Define bond parameters
     issue_date = ql.Date(1, 1, 2020)
     maturity_date = ql.Date(1, 1, 2030)
     coupon_rate = 0.04
 
-    # Generate bond prices for a year
-    dates = []
-    prices = []
-    for i in range(365):
-        date = today + ql.Period(i, ql.Days)
-        ql.Settings.instance().evaluationDate = date
-        price = price_bond(yield_curve, issue_date, maturity_date, coupon_rate)
-        dates.append(date.to_date())
-        prices.append(price)
-
-    # Create a pandas DataFrame with the bond prices
-    df = pd.DataFrame({'Date': dates, 'Price': prices})
-    df.set_index('Date', inplace=True)
-
-    # Set up Backtrader
-    cerebro = bt.Cerebro()
-    data = bt.feeds.PandasData(dataname=df)
+    dates = [today + ql.Period(i, ql.Days) for i in range(365)]
+    strategy_kwargs = {}
+
+    if streaming:
+        # Price each bar lazily as Backtrader consumes it
+        yield_curve = build_yield_curve(today, spot_dates, spot_rates)
+        session = BondRepricingSession(yield_curve, issue_date, maturity_date, coupon_rate)
+        cerebro = bt.Cerebro(preload=False)
+        data = StreamingPriceFeed(dataname=session.iter_prices(dates))
+    else:
+        # Generate bond prices for a year; one bond is too little work for a process pool
+        bonds = [(issue_date, maturity_date, coupon_rate)]
+        df = sweep_frame(today, spot_dates, spot_rates, bonds, dates, labels=['Price'], max_workers=1)
+        # The full series is known up front, so compute RSI once instead of per bar
+        df = add_precomputed_indicators(df)
+        cerebro = bt.Cerebro()
+        data = PrecomputedIndicatorData(dataname=df, open='Price', close='Price')
+        strategy_kwargs['precomputed_rsi'] = True
     
     cerebro.adddata(data)
-    cerebro.addstrategy(BondTradingStrategy)
+    cerebro.addstrategy(BondTradingStrategy, **strategy_kwargs)
     cerebro.run()
-    cerebro.plot()
+    if plot:
+        cerebro.plot()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
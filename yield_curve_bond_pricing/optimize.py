@@ -0,0 +1,132 @@
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+
+from backtrader_strategy import BondTradingStrategy, PrecomputedIndicatorData, add_precomputed_indicators
+
+# Per-process state: workers attach to the shared price block once and keep
+# one indicator frame per rsi_period, so runs only exchange parameters and metrics.
+_worker_shm = None
+_worker_series = None
+_worker_frames = {}
+
+
+def _init_worker(shm_name, n_bars, cash):
+    global _worker_shm, _worker_series, _worker_frames
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    block = np.ndarray((2, n_bars), dtype=np.int64, buffer=_worker_shm.buf)
+    _worker_series = (block[0], block[1].view(np.float64), cash)
+    _worker_frames = {}
+
+
+def _frame(rsi_period):
+    frame = _worker_frames.get(rsi_period)
+    if frame is None:
+        timestamps, prices, _ = _worker_series
+        frame = pd.DataFrame({'Price': prices}, index=pd.DatetimeIndex(timestamps.view('datetime64[ns]'), name='Date'))
+        frame = add_precomputed_indicators(frame, rsi_period=rsi_period)
+        _worker_frames[rsi_period] = frame
+    return frame
+
+
+def _run_candidate(params):
+    cash = _worker_series[2]
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.broker.setcash(cash)
+    cerebro.adddata(PrecomputedIndicatorData(dataname=_frame(params['rsi_period']), open='Price', close='Price'))
+    cerebro.addstrategy(BondTradingStrategy, precomputed_rsi=True, **params)
+    cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name='trades')
+    strategy = cerebro.run()[0]
+
+    trades = strategy.analyzers.trades.get_analysis()
+    final_value = cerebro.broker.getvalue()
+    return {
+        **params,
+        'final_value': final_value,
+        'total_return': final_value / cash - 1,
+        'trades': trades.get('total', {}).get('total', 0),
+    }
+
+
+def parameter_grid(grid):
+    """
+    Expands {'name': [values, ...]} into every parameter combination.
+
+    Returns:
+    list: One dict per combination
+    """
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[n] for n in names))]
+
+
+def random_parameters(space, n_iter, seed=None):
+    """
+    Samples n_iter parameter dicts uniformly (with replacement) from {'name': [values, ...]}.
+
+    Returns:
+    list: One dict per sample
+    """
+    rng = random.Random(seed)
+    return [{name: rng.choice(list(values)) for name, values in space.items()} for _ in range(n_iter)]
+
+
+def optimize_strategy(df, candidates, price_column='Price', cash=10000.0, max_workers=None):
+    """
+    Runs BondTradingStrategy for each parameter set across a process pool.
+
+    The price series is copied once into a shared memory block that every
+    worker maps read-only; only the parameter dicts and a few metrics per
+    run cross process boundaries. RSI is precomputed once per rsi_period in
+    each worker and each run keeps no strategy objects alive.
+
+    Args:
+    df (pd.DataFrame): Price frame with a DatetimeIndex
+    candidates (list): Parameter dicts, e.g. from parameter_grid or random_parameters
+    price_column (str): Column holding the prices
+    cash (float): Starting cash for each run
+    max_workers (int): Pool size, os.cpu_count() by default; 1 runs in-process
+
+    Returns:
+    pd.DataFrame: One row per candidate, best final value first
+    """
+    global _worker_shm, _worker_series
+    n_bars = len(df)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, 2 * n_bars * 8))
+    try:
+        block = np.ndarray((2, n_bars), dtype=np.int64, buffer=shm.buf)
+        block[0] = pd.DatetimeIndex(df.index).as_unit('ns').asi8
+        block[1] = df[price_column].to_numpy(dtype=np.float64).view(np.int64)
+        del block
+
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers == 1:
+            _init_worker(shm.name, n_bars, cash)
+            try:
+                results = [_run_candidate(params) for params in candidates]
+            finally:
+                # Views into the block must be dropped before it can be closed
+                _worker_series = None
+                _worker_frames.clear()
+                _worker_shm.close()
+                _worker_shm = None
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(shm.name, n_bars, cash)) as pool:
+                chunksize = max(1, len(candidates) // (4 * max_workers))
+                results = list(pool.map(_run_candidate, candidates, chunksize=chunksize))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    ranking = pd.DataFrame(results)
+    if ranking.empty:
+        return ranking
+    ranking = ranking.sort_values('final_value', ascending=False, kind='stable').reset_index(drop=True)
+    ranking.index.name = 'rank'
+    return ranking
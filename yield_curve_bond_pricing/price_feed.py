@@ -0,0 +1,54 @@
+import datetime
+
+import backtrader as bt
+import QuantLib as ql
+
+
+class StreamingPriceFeed(bt.feed.DataBase):
+    """
+    Backtrader feed that pulls bars lazily from an iterable of (date, price) pairs.
+
+    Each bar is read only when Backtrader asks for it, so the source can be
+    a generator over the pricing engine (e.g. BondRepricingSession.iter_prices)
+    and pricing overlaps with the strategy instead of finishing first. Dates
+    may be ql.Date, datetime.date or datetime.datetime; the price fills open,
+    high, low and close.
+
+    For constant memory on long runs, create the Cerebro with preload=False
+    (so bars are not buffered up front) and exactbars=1 (so line history is
+    trimmed to what indicators need). Plotting requires the full history and
+    is not available with exactbars.
+
+    Usage:
+    data = StreamingPriceFeed(dataname=session.iter_prices(dates))
+    """
+
+    def start(self):
+        super().start()
+        self._source = iter(self.p.dataname)
+
+    def stop(self):
+        close = getattr(getattr(self, '_source', None), 'close', None)
+        if close is not None:
+            close()
+        super().stop()
+
+    def _load(self):
+        try:
+            date, price = next(self._source)
+        except StopIteration:
+            return False
+
+        if isinstance(date, ql.Date):
+            date = date.to_date()
+        if not isinstance(date, datetime.datetime):
+            date = datetime.datetime.combine(date, datetime.time())
+
+        self.lines.datetime[0] = bt.date2num(date)
+        self.lines.open[0] = price
+        self.lines.high[0] = price
+        self.lines.low[0] = price
+        self.lines.close[0] = price
+        self.lines.volume[0] = 0.0
+        self.lines.openinterest[0] = 0.0
+        return True
@@ -0,0 +1,129 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import QuantLib as ql
+
+from yield_curve import build_yield_curve
+from bond_pricing import BondRepricingSession
+
+# Per-process state: ql.Settings is a process-wide singleton, so every worker
+# owns its curve and sessions and nothing QuantLib-related crosses processes.
+_worker_curve = None
+_worker_sessions = {}
+
+# Prices below which another worker costs more to start than it saves;
+# the default pool never has fewer than this per worker
+MIN_PRICES_PER_WORKER = 2000
+
+
+def _init_worker(evaluation_serial, spot_serials, spot_rates):
+    global _worker_curve, _worker_sessions
+    _worker_curve = build_yield_curve(ql.Date(evaluation_serial), [ql.Date(s) for s in spot_serials],
+                                      list(spot_rates), cache=None)
+    _worker_sessions = {}
+
+
+def _price_task(task):
+    bonds, date_serials = task
+    dates = [ql.Date(s) for s in date_serials]
+    prices = np.empty((len(dates), len(bonds)))
+    for j, bond in enumerate(bonds):
+        session = _worker_sessions.get(bond)
+        if session is None:
+            issue_serial, maturity_serial, coupon_rate, face_value = bond
+            session = BondRepricingSession(_worker_curve, ql.Date(issue_serial), ql.Date(maturity_serial),
+                                           coupon_rate, face_value)
+            _worker_sessions[bond] = session
+        prices[:, j] = session.price_series(dates)
+    return prices
+
+
+def _bond_key(bond):
+    issue_date, maturity_date, coupon_rate = bond[:3]
+    face_value = bond[3] if len(bond) > 3 else 100
+    return (issue_date.serialNumber(), maturity_date.serialNumber(), float(coupon_rate), float(face_value))
+
+
+def _shards(n, size):
+    return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+def sweep_prices(evaluation_date, spot_dates, spot_rates, bonds, dates, max_workers=None,
+                 dates_per_task=None, bonds_per_task=16):
+    """
+    Prices bonds over a range of evaluation dates across a process pool.
+
+    Dates and bonds are cut into (date shard, bond shard) tasks. Each worker
+    builds the curve once when it starts and keeps one BondRepricingSession
+    per bond it sees. Results are yielded in task order as they complete.
+
+    Args:
+    evaluation_date (ql.Date): Evaluation date the curve is built at
+    spot_dates (list): List of ql.Date objects for spot rates
+    spot_rates (list): List of spot rates corresponding to spot_dates
+    bonds (list): (issue_date, maturity_date, coupon_rate[, face_value]) tuples
+    dates (list): ql.Date evaluation dates to price at
+    max_workers (int): Pool size, at most one per task; by default os.cpu_count() capped at one
+        per MIN_PRICES_PER_WORKER prices, so small sweeps run in-process. 1 runs in-process
+    dates_per_task (int): Dates per task, sized for ~4 tasks per worker by default
+    bonds_per_task (int): Bonds per task
+
+    Yields:
+    tuple: (date_slice, bond_slice, prices) with prices shaped dates x bonds
+    """
+    bond_keys = [_bond_key(b) for b in bonds]
+    date_serials = [d.serialNumber() for d in dates]
+    if not max_workers:
+        n_prices = len(bond_keys) * len(date_serials)
+        max_workers = max(1, min(os.cpu_count() or 1, n_prices // MIN_PRICES_PER_WORKER))
+    if dates_per_task is None:
+        bond_shards = math.ceil(len(bond_keys) / bonds_per_task) or 1
+        dates_per_task = max(1, math.ceil(len(date_serials) * bond_shards / (4 * max_workers)))
+
+    slices = [(slice(d0, d1), slice(b0, b1))
+              for d0, d1 in _shards(len(date_serials), dates_per_task)
+              for b0, b1 in _shards(len(bond_keys), bonds_per_task)]
+    tasks = [(tuple(bond_keys[b]), date_serials[d]) for d, b in slices]
+    max_workers = max(1, min(max_workers, len(tasks)))
+    init_args = (evaluation_date.serialNumber(), [d.serialNumber() for d in spot_dates], list(spot_rates))
+
+    if max_workers == 1:
+        original_date = ql.Settings.instance().evaluationDate
+        try:
+            _init_worker(*init_args)
+            for (d, b), task in zip(slices, tasks):
+                yield d, b, _price_task(task)
+        finally:
+            ql.Settings.instance().evaluationDate = original_date
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=init_args) as pool:
+        for (d, b), prices in zip(slices, pool.map(_price_task, tasks)):
+            yield d, b, prices
+
+
+def sweep_frame(evaluation_date, spot_dates, spot_rates, bonds, dates, labels=None, **kwargs):
+    """
+    Runs sweep_prices and merges the shards into one DataFrame.
+
+    The frame is indexed by a DatetimeIndex named 'Date' with one column per
+    bond, in the order given, so it can be passed to bt.feeds.PandasData.
+    The result does not depend on the pool size or shard sizes.
+
+    Args:
+    labels (list): Column names, 'bond_0', 'bond_1', ... by default
+    **kwargs: Passed through to sweep_prices
+
+    Returns:
+    pd.DataFrame: Clean prices, dates x bonds
+    """
+    prices = np.empty((len(dates), len(bonds)))
+    for d, b, chunk in sweep_prices(evaluation_date, spot_dates, spot_rates, bonds, dates, **kwargs):
+        prices[d, b] = chunk
+
+    index = pd.DatetimeIndex([pd.Timestamp(date.to_date()) for date in dates], name='Date')
+    labels = labels if labels is not None else [f'bond_{i}' for i in range(len(bonds))]
+    return pd.DataFrame(prices, index=index, columns=labels)
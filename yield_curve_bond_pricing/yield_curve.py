@@ -1,26 +1,140 @@
+import hashlib
+from collections import OrderedDict
+
 import QuantLib as ql
 
-def build_yield_curve(evaluation_date, spot_dates, spot_rates):
+
+def curve_key(evaluation_date, spot_dates, spot_rates, day_count, calendar, interpolation,
+              compounding, compounding_frequency):
+    """
+    Builds a canonical hash of the inputs that define a zero curve.
+
+    Args:
+    evaluation_date (ql.Date): The evaluation date for the curve
+    spot_dates (list): List of ql.Date objects for spot rates
+    spot_rates (list): List of spot rates corresponding to spot_dates
+    day_count (ql.DayCounter): Day count convention of the curve
+    calendar (ql.Calendar): Calendar of the curve
+    interpolation: QuantLib interpolation factory (e.g. ql.Linear())
+    compounding (int): QuantLib compounding enum
+    compounding_frequency (int): QuantLib frequency enum
+
+    Returns:
+    str: Hex digest identifying the curve
+    """
+    parts = (
+        evaluation_date.serialNumber(),
+        tuple(d.serialNumber() for d in spot_dates),
+        tuple(float(r).hex() for r in spot_rates),
+        day_count.name(),
+        calendar.name(),
+        type(interpolation).__name__,
+        int(compounding),
+        int(compounding_frequency),
+    )
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+class CurveCache:
+    """
+    Bounded LRU cache of yield curve handles keyed by curve_key().
+
+    Args:
+    maxsize (int): Maximum number of curves kept before the least recently
+        used one is evicted
+    """
+
+    def __init__(self, maxsize=128):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._curves = OrderedDict()
+
+    def __len__(self):
+        return len(self._curves)
+
+    def __contains__(self, key):
+        return key in self._curves
+
+    def get_or_build(self, key, builder):
+        """
+        Returns the cached curve for key, calling builder() on a miss.
+        """
+        if key in self._curves:
+            self._curves.move_to_end(key)
+            self.hits += 1
+            return self._curves[key]
+
+        self.misses += 1
+        curve = builder()
+        self._curves[key] = curve
+        if len(self._curves) > self.maxsize:
+            self._curves.popitem(last=False)
+            self.evictions += 1
+        return curve
+
+    def invalidate(self, key=None):
+        """
+        Drops a single curve, or every curve when key is None.
+
+        Returns:
+        int: Number of curves removed
+        """
+        if key is None:
+            removed = len(self._curves)
+            self._curves.clear()
+            return removed
+        return 1 if self._curves.pop(key, None) is not None else 0
+
+    def stats(self):
+        return {
+            'size': len(self._curves),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+curve_cache = CurveCache()
+
+
+def build_yield_curve(evaluation_date, spot_dates, spot_rates, day_count=None, calendar=None,
+                      interpolation=None, cache=curve_cache):
     """
     Constructs a yield curve using QuantLib.
-    
+
     Args:
     evaluation_date (ql.Date): The evaluation date for the curve
     spot_dates (list): List of ql.Date objects for spot rates
     spot_rates (list): List of spot rates corresponding to spot_dates
-    
+    day_count (ql.DayCounter): Day count convention, Actual365Fixed by default
+    calendar (ql.Calendar): Curve calendar, TARGET by default
+    interpolation: QuantLib interpolation factory, ql.Linear() by default
+    cache (CurveCache): Cache to reuse curves from, or None to always rebuild
+
     Returns:
     ql.YieldTermStructureHandle: The constructed yield curve
     """
     ql.Settings.instance().evaluationDate = evaluation_date
-    
-    day_count = ql.Actual365Fixed()
-    calendar = ql.TARGET()
-    interpolation = ql.Linear()
+
+    day_count = day_count if day_count is not None else ql.Actual365Fixed()
+    calendar = calendar if calendar is not None else ql.TARGET()
+    interpolation = interpolation if interpolation is not None else ql.Linear()
     compounding = ql.Compounded
     compounding_frequency = ql.Annual
-    
-    spot_curve = ql.ZeroCurve(spot_dates, spot_rates, day_count, calendar, 
-                              interpolation, compounding, compounding_frequency)
-    
-    return ql.YieldTermStructureHandle(spot_curve)
\ No newline at end of file
+
+    def build():
+        spot_curve = ql.ZeroCurve(spot_dates, spot_rates, day_count, calendar,
+                                  interpolation, compounding, compounding_frequency)
+        return ql.YieldTermStructureHandle(spot_curve)
+
+    if cache is None:
+        return build()
+
+    key = curve_key(evaluation_date, spot_dates, spot_rates, day_count, calendar,
+                    interpolation, compounding, compounding_frequency)
+    return cache.get_or_build(key, build)